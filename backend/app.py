@@ -2,6 +2,7 @@ from dotenv import load_dotenv
 load_dotenv()  # <-- This loads your .env file
 
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from backend.routes.quote import router as quote_router
@@ -23,10 +24,21 @@ setup_logging(log_level=log_level, log_file=log_file, enable_json=True)
 
 logger = get_logger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    logger.info("RentalAI Copilot API starting up")
+    logger.info(f"Log level: {log_level}")
+    logger.info(f"Log file: {log_file}")
+    yield
+    logger.info("RentalAI Copilot API shutting down")
+
+
 app = FastAPI(
     title="RentalAI Copilot API",
     description="Autonomous quoting system for the equipment rental industry",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Add exception handlers
@@ -46,7 +58,7 @@ app.add_middleware(
     ],
     allow_origin_regex=r"https://.*\.app\.github\.dev$",  # for Codespaces
     allow_credentials=True,
-    allow_methods=["*"],
+    allow_methods=["GET", "POST"],
     allow_headers=["*"],
 )
 
@@ -56,18 +68,6 @@ app.include_router(runs_router)
 app.include_router(inventory_router)
 app.include_router(tts_router)
 
-# Startup event
-@app.on_event("startup")
-async def startup_event():
-    logger.info("RentalAI Copilot API starting up")
-    logger.info(f"Log level: {log_level}")
-    logger.info(f"Log file: {log_file}")
-
-# Shutdown event
-@app.on_event("shutdown")
-async def shutdown_event():
-    logger.info("RentalAI Copilot API shutting down")
-
 # Health check endpoint
 @app.get("/health", tags=["health"])
 async def health_check():
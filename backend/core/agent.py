@@ -1,43 +1,177 @@
 from __future__ import annotations
-import re, json, time, os
-from typing import Dict, Any, List
-from dateutil import parser as dateparser
-from sqlalchemy import text
+import re, time, os, threading, logging, hashlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, Any, List, Optional
+import orjson
+from sqlalchemy import text, bindparam
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.engine import Connection
 
-from dotenv import load_dotenv
-from openai import OpenAI
-from openai import OpenAIError
-
-from backend.db.connect import SessionLocal
-from backend.core.tracing import add_step
+from backend.db.connect import engine
+from backend.core.tracing import add_step_batch, step_row
 from backend.core.logging_config import get_logger
 from backend.core.exceptions import DatabaseError, AIServiceError, QuoteGenerationError
 from backend.core.item_parser import parse_items_from_message, extract_duration_hint
 from backend.core.location_resolver import resolve_location
 
-# Load .env so OPENAI_API_KEY is available
-load_dotenv()
-
 # Create logger
 logger = get_logger(__name__)
 
-# Create a single OpenAI client for this module
+# The OpenAI client is built on first use (see _get_openai_client), but a
+# missing key should still fail at startup. backend.db.connect has already
+# loaded .env by this point.
 api_key = os.getenv("OPENAI_API_KEY")
 if not api_key:
     logger.error("OPENAI_API_KEY not found in environment")
     raise ValueError("OPENAI_API_KEY environment variable is required")
 
-client = OpenAI(api_key=api_key)
-logger.info("OpenAI client initialized successfully")
-
+_client = None
+_CLIENT_LOCK = threading.Lock()
+
+# SQL statements, built once instead of on every lookup
+_Q_POLICIES = text("SELECT key_name, value_json FROM policies")
+_Q_RATES = text(
+    "SELECT r.sku, r.daily, r.delivery_fee_base, i.name "
+    "FROM rates r LEFT JOIN inventory i ON i.sku = r.sku "
+    "WHERE r.sku IN :skus"
+).bindparams(bindparam("skus", expanding=True))
+
+# Pricing policies change rarely, so keep them in-process for a short TTL
+_POLICIES_TTL_S = float(os.getenv("POLICIES_TTL_S", "60"))
+# Single (expires_at, policies, PolicyView) tuple so lock-free readers see a
+# consistent entry
+_POLICIES_CACHE: Dict[str, Any] = {"entry": (0.0, None, None)}
+_POLICIES_LOCK = threading.Lock()
+
+# Rate rows (with item name) per SKU: a bounded LRU whose entries expire after a TTL
+_RATES_TTL_S = float(os.getenv("RATES_TTL_S", "300"))
+_RATES_CACHE_MAX = 256
+_RATES_CACHE: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+_RATES_LOCK = threading.Lock()
+
+# The AI summary runs on a worker pool so it overlaps with the rest of the quote
+_AI_POOL = ThreadPoolExecutor(
+    max_workers=int(os.getenv("AI_POOL_WORKERS", "8")), thread_name_prefix="ai-summary"
+)
+_AI_SUMMARY_TIMEOUT_S = float(os.getenv("AI_SUMMARY_TIMEOUT_S", "15"))
+_OPENAI_TIMEOUT_S = float(os.getenv("OPENAI_TIMEOUT_S", "10"))
+
+# The summary is 2-3 sentences; 160 tokens fits that in every supported
+# language (Japanese/Arabic need the most) while bounding slow generations
+_SUMMARY_MAX_TOKENS = int(os.getenv("SUMMARY_MAX_TOKENS", "160"))
+_SENTENCE_ENDS = (".", "!", "?", "。", "！", "？", "؟")
+
+# Identical quotes produce identical prompts; reuse their explanation for a while
+_SUMMARY_CACHE_TTL_S = float(os.getenv("SUMMARY_CACHE_TTL_S", "600"))
+_SUMMARY_CACHE_MAX = 512
+_SUMMARY_CACHE: "OrderedDict[bytes, tuple[float, str]]" = OrderedDict()
+_SUMMARY_LOCK = threading.Lock()
+
+# Language-specific labels for notes
+LANGUAGE_LABELS = {
+    "en-US": {
+        "parsing_note": "Intelligent parsing identified {count} equipment type(s) from your request.",
+        "fallback_note": "Sample quote generated. Please specify your equipment needs for an accurate estimate.",
+        "date_note": "Rental period: {days} day(s) based on your specified dates.",
+        "duration_note": "Estimated {days}-day rental based on your request.",
+        "unmatched_note": "Note: Could not match the following items: {items}. Please verify or contact us for assistance.",
+        "ai_fallback": "Our AI quote assistant is temporarily unavailable, but your quote has been calculated accurately.",
+        "ai_error": "Quote calculated successfully. Our team is ready to assist with any questions.",
+    },
+    "es-ES": {
+        "parsing_note": "El análisis inteligente identificó {count} tipo(s) de equipo de su solicitud.",
+        "fallback_note": "Cotización de muestra generada. Especifique sus necesidades de equipo para un presupuesto preciso.",
+        "date_note": "Período de alquiler: {days} día(s) según las fechas especificadas.",
+        "duration_note": "Alquiler estimado de {days} día(s) según su solicitud.",
+        "unmatched_note": "Nota: No se pudieron encontrar los siguientes artículos: {items}. Verifique o contáctenos para asistencia.",
+        "ai_fallback": "Nuestro asistente de cotización AI no está disponible temporalmente, pero su cotización se ha calculado con precisión.",
+        "ai_error": "Cotización calculada exitosamente. Nuestro equipo está listo para ayudarle con cualquier pregunta.",
+    },
+    "ar-SA": {
+        "parsing_note": "حدد التحليل الذكي {count} نوع(أنواع) من المعدات من طلبك.",
+        "fallback_note": "تم إنشاء عرض أسعار نموذجي. يرجى تحديد احتياجاتك من المعدات للحصول على تقدير دقيق.",
+        "date_note": "فترة الإيجار: {days} يوم(أيام) بناءً على التواريخ المحددة.",
+        "duration_note": "إيجار تقديري لمدة {days} يوم(أيام) بناءً على طلبك.",
+        "unmatched_note": "ملاحظة: لم نتمكن من مطابقة العناصر التالية: {items}. يرجى التحقق أو الاتصال بنا للمساعدة.",
+        "ai_fallback": "مساعد عرض الأسعار الذكي غير متاح مؤقتًا، ولكن تم حساب عرض الأسعار الخاص بك بدقة.",
+        "ai_error": "تم حساب عرض الأسعار بنجاح. فريقنا جاهز للمساعدة في أي أسئلة.",
+    },
+    "ja-JP": {
+        "parsing_note": "インテリジェント解析により、リクエストから{count}種類の機器を特定しました。",
+        "fallback_note": "サンプル見積もりが生成されました。正確な見積もりのために機器のニーズをご指定ください。",
+        "date_note": "レンタル期間：指定された日付に基づく{days}日間。",
+        "duration_note": "リクエストに基づく推定{days}日間のレンタル。",
+        "unmatched_note": "注：以下のアイテムをマッチングできませんでした：{items}。確認するか、サポートにお問い合わせください。",
+        "ai_fallback": "AI見積もりアシスタントは一時的に利用できませんが、見積もりは正確に計算されています。",
+        "ai_error": "見積もりは正常に計算されました。ご質問がございましたら、チームがお手伝いいたします。",
+    },
+}
+
+# Customer tier display names for the AI prompt
+TIER_NAMES = {"A": "Premium", "B": "Corporate", "C": "Standard"}
+
+# Language name mapping for AI prompt
+LANGUAGE_NAMES = {
+    "en-US": "English",
+    "es-ES": "Spanish",
+    "ar-SA": "Arabic",
+    "ja-JP": "Japanese",
+}
+
+
+def _get_openai_client():
+    """
+    Return the shared OpenAI client, importing openai/httpx and building it
+    on first call so module import stays cheap.
+    """
+    global _client
+    if _client is None:
+        with _CLIENT_LOCK:
+            if _client is None:
+                import httpx
+                from openai import OpenAI
+
+                # Pooled HTTP/2 transport so summary calls reuse TCP+TLS connections
+                http_client = httpx.Client(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+                )
+                # Requests never outlive the time the quote waits for them, so a
+                # slow OpenAI cannot keep pool workers busy after the quote has
+                # fallen back. Connect fails fast so a dead route falls back quickly.
+                # No retries: a second attempt would outlive AI_SUMMARY_TIMEOUT_S.
+                _client = OpenAI(
+                    api_key=api_key,
+                    http_client=http_client,
+                    timeout=httpx.Timeout(
+                        min(_OPENAI_TIMEOUT_S, _AI_SUMMARY_TIMEOUT_S),
+                        connect=min(2.0, _AI_SUMMARY_TIMEOUT_S),
+                    ),
+                    max_retries=0,
+                )
+                logger.info("OpenAI client initialized successfully")
+    return _client
+
+
+def _parse_date(value: str) -> date:
+    """Parse a date string, trying the fast ISO-8601 path before dateutil."""
+    try:
+        return datetime.fromisoformat(value.strip()).date()
+    except ValueError:
+        from dateutil import parser as dateparser
 
-def _now_ms() -> int:
-    return int(time.time() * 1000)
+        return dateparser.parse(value).date()
 
 
 def _duration_days(
-    start_s: str | None, end_s: str | None, message: str = "", fallback_days: int = 3
+    start_s: str | None,
+    end_s: str | None,
+    duration_hint: Optional[int] = None,
+    fallback_days: int = 3,
 ) -> int:
     """
     Calculate rental duration from dates or message hints.
@@ -45,7 +179,7 @@ def _duration_days(
     Args:
         start_s: Start date string
         end_s: End date string
-        message: Customer message (may contain duration hints)
+        duration_hint: Days hinted by the customer message (extract_duration_hint)
         fallback_days: Default duration if nothing is found
 
     Returns:
@@ -54,45 +188,69 @@ def _duration_days(
     try:
         # First try explicit dates
         if start_s and end_s:
-            start = dateparser.parse(start_s).date()
-            end = dateparser.parse(end_s).date()
+            start = _parse_date(start_s)
+            end = _parse_date(end_s)
             days = max(1, (end - start).days + 1)
-            logger.debug(f"Calculated duration from dates: {days} days ({start_s} to {end_s})")
+            logger.debug("Calculated duration from dates: %s days (%s to %s)", days, start_s, end_s)
             return days
     except Exception as e:
         logger.warning(f"Failed to parse dates: {str(e)}")
 
-    # Try to extract from message
-    if message:
-        duration_hint = extract_duration_hint(message)
-        if duration_hint:
-            logger.debug(f"Extracted duration from message: {duration_hint} days")
-            return duration_hint
+    # Fall back to the hint from the message
+    if duration_hint:
+        logger.debug("Extracted duration from message: %s days", duration_hint)
+        return duration_hint
 
-    logger.debug(f"Using fallback duration: {fallback_days} days")
+    logger.debug("Using fallback duration: %s days", fallback_days)
     return fallback_days
 
 
-def _fetch_policies() -> Dict[str, Any]:
+def _connection_scope(conn: Optional[Connection]):
+    """
+    Reuse the caller's connection if given, otherwise check one out of the pool.
+    These lookups are read-only, so a bare Connection avoids ORM Session setup.
+    """
+    return nullcontext(conn) if conn is not None else engine.connect()
+
+
+@dataclass(frozen=True, slots=True)
+class PolicyView:
+    """Typed percentages _compute needs, extracted once per policies load."""
+
+    tier_pct: Dict[str, float]
+    damage_waiver_pct: float
+    tax_pct: float
+
+    @classmethod
+    def from_policies(cls, policies: Dict[str, Any]) -> "PolicyView":
+        tier_discounts = policies.get("tier_discounts", {})
+        return cls(
+            tier_pct={t: float(v.get("pct", 0.0)) for t, v in tier_discounts.items()},
+            damage_waiver_pct=float((policies.get("default_damage_waiver") or {}).get("pct", 0.0)),
+            tax_pct=float((policies.get("tax_rate") or {}).get("pct", 0.0)),
+        )
+
+
+def _load_policies(conn: Optional[Connection] = None) -> Dict[str, Any]:
     logger.debug("Fetching pricing policies from database")
     try:
-        with SessionLocal() as s:
+        with _connection_scope(conn) as c:
             rows = (
-                s.execute(text("SELECT key_name, value_json FROM policies"))
+                c.execute(_Q_POLICIES)
                 .mappings()
                 .all()
             )
             out = {}
             for r in rows:
                 val = r["value_json"]
-                if isinstance(val, (str, bytes)):
+                # orjson decodes str and raw driver buffers alike, no decode() needed
+                if isinstance(val, (str, bytes, bytearray, memoryview)):
                     try:
-                        val = json.loads(val)
-                    except Exception as e:
+                        val = orjson.loads(val)
+                    except orjson.JSONDecodeError as e:
                         logger.warning(
                             f"Failed to parse policy {r['key_name']}: {str(e)}"
                         )
-                        pass
                 out[r["key_name"]] = val
             logger.info(f"Loaded {len(out)} pricing policies")
             return out
@@ -101,45 +259,149 @@ def _fetch_policies() -> Dict[str, Any]:
         raise DatabaseError("Failed to fetch pricing policies", details={"error": str(e)})
 
 
-def _fetch_rate_for_sku(sku: str) -> Dict[str, Any]:
-    logger.debug(f"Fetching rate for SKU: {sku}")
-    try:
-        with SessionLocal() as s:
-            r = (
-                s.execute(text("SELECT * FROM rates WHERE sku=:sku"), {"sku": sku})
-                .mappings()
-                .first()
-            )
-            if not r:
-                logger.warning(f"No rate found for SKU: {sku}")
-                raise ValueError(f"rate not found for {sku}")
-            logger.debug(f"Found rate for SKU {sku}: daily=${r.get('daily')}")
-            return dict(r)
-    except SQLAlchemyError as e:
-        logger.error(f"Database error fetching rate for SKU {sku}: {str(e)}", exc_info=True)
-        raise DatabaseError(f"Failed to fetch rate for SKU {sku}", details={"sku": sku, "error": str(e)})
+def _fetch_policies(conn: Optional[Connection] = None) -> Dict[str, Any]:
+    """
+    Return pricing policies, reloading from the database once the TTL expires.
+
+    Fresh hits are served without taking the lock. On expiry the lock makes
+    concurrent requests wait for a single reload instead of all hitting the
+    database, and the re-check inside it lets the waiters reuse that reload.
+    """
+    expires_at, cached, _ = _POLICIES_CACHE["entry"]
+    if cached is not None and time.monotonic() < expires_at:
+        logger.debug("Using cached pricing policies")
+        return cached
+
+    with _POLICIES_LOCK:
+        expires_at, cached, _ = _POLICIES_CACHE["entry"]
+        if cached is not None and time.monotonic() < expires_at:
+            return cached
+
+        policies = _load_policies(conn)
+        _POLICIES_CACHE["entry"] = (
+            time.monotonic() + _POLICIES_TTL_S,
+            policies,
+            PolicyView.from_policies(policies),
+        )
+        return policies
+
+
+def _policy_view(policies: Dict[str, Any]) -> PolicyView:
+    """Return the precomputed view for the cached policies, or build one."""
+    _, cached, view = _POLICIES_CACHE["entry"]
+    if policies is cached and view is not None:
+        return view
+    return PolicyView.from_policies(policies)
 
 
-def _fetch_name_for_sku(sku: str) -> str:
-    logger.debug(f"Fetching inventory name for SKU: {sku}")
+def invalidate_policies() -> None:
+    """Drop cached pricing policies so the next quote reloads them."""
+    with _POLICIES_LOCK:
+        _POLICIES_CACHE["entry"] = (0.0, None, None)
+
+
+def _load_rates_for_skus(
+    skus: List[str], conn: Optional[Connection] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch rate and inventory name for a set of SKUs in a single round-trip.
+
+    Args:
+        skus: SKUs to look up (duplicates are ignored)
+        conn: Optional open connection to reuse
+
+    Returns:
+        Dict keyed by SKU with daily, delivery_fee_base and name.
+        SKUs without a rate row are absent from the result.
+    """
+    unique_skus = list(dict.fromkeys(skus))
+    logger.debug("Fetching rates for %d SKUs: %s", len(unique_skus), unique_skus)
     try:
-        with SessionLocal() as s:
-            r = (
-                s.execute(text("SELECT name FROM inventory WHERE sku=:sku"), {"sku": sku})
+        with _connection_scope(conn) as c:
+            rows = (
+                c.execute(_Q_RATES, {"skus": unique_skus})
                 .mappings()
-                .first()
+                .all()
             )
-            name = r["name"] if r else sku
-            if not r:
-                logger.warning(f"No inventory item found for SKU {sku}, using SKU as name")
-            return name
+            return {r["sku"]: dict(r) for r in rows}
     except SQLAlchemyError as e:
-        logger.error(f"Database error fetching inventory name for SKU {sku}: {str(e)}", exc_info=True)
-        return sku  # Fallback to SKU if database fails
+        logger.error(f"Database error fetching rates for SKUs {unique_skus}: {str(e)}", exc_info=True)
+        raise DatabaseError("Failed to fetch rates", details={"skus": unique_skus, "error": str(e)})
+
+
+def _fetch_rates_for_skus(
+    skus: List[str], conn: Optional[Connection] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Return rate rows for the given SKUs, serving fresh entries from the
+    per-SKU cache and loading only the misses from the database.
+    """
+    now = time.monotonic()
+    found: Dict[str, Dict[str, Any]] = {}
+    missing: List[str] = []
+    with _RATES_LOCK:
+        for sku in dict.fromkeys(skus):
+            entry = _RATES_CACHE.get(sku)
+            if entry is not None and now - entry[0] < _RATES_TTL_S:
+                _RATES_CACHE.move_to_end(sku)
+                found[sku] = entry[1]
+            else:
+                missing.append(sku)
+
+    if not missing:
+        logger.debug("Using cached rates for %d SKUs", len(found))
+        return found
+
+    loaded = _load_rates_for_skus(missing, conn)
+    with _RATES_LOCK:
+        for sku, row in loaded.items():
+            _RATES_CACHE[sku] = (now, row)
+            _RATES_CACHE.move_to_end(sku)
+        while len(_RATES_CACHE) > _RATES_CACHE_MAX:
+            _RATES_CACHE.popitem(last=False)
+
+    found.update(loaded)
+    return found
+
+
+def invalidate_rates(sku: Optional[str] = None) -> None:
+    """
+    Drop cached SKU rates so the next quote reloads them.
+
+    Args:
+        sku: Only forget this SKU (e.g. after its rate or name changed);
+             clears the whole cache when omitted
+    """
+    with _RATES_LOCK:
+        if sku is None:
+            _RATES_CACHE.clear()
+        else:
+            _RATES_CACHE.pop(sku, None)
+
+
+def _to_cents(amount: Any) -> int:
+    """Convert a dollar amount (float, Decimal or numeric string) to whole cents."""
+    return round(float(amount) * 100)
+
+
+def _pct_of_cents(cents: int, pct: float) -> int:
+    """
+    Return pct percent of an amount in cents, rounded to a whole cent with
+    ties away from zero (so 0.5 cents becomes 1 and -0.5 cents becomes -1).
+    """
+    if not pct:
+        return 0
+    micro_pct = round(pct * 1_000_000)  # exact for up to six decimal places
+    part = (abs(cents) * abs(micro_pct) + 50_000_000) // 100_000_000
+    return part if (cents >= 0) == (micro_pct >= 0) else -part
 
 
 def _compute(
-    items: List[Dict[str, Any]], days: int, policies: Dict[str, Any], tier: str = "C"
+    items: List[Dict[str, Any]],
+    days: int,
+    policies: Dict[str, Any],
+    tier: str = "C",
+    conn: Optional[Connection] = None,
 ) -> Dict[str, Any]:
     """
     Compute quote pricing with tier discount support.
@@ -149,44 +411,58 @@ def _compute(
         days: Rental duration in days
         policies: Pricing policies from database
         tier: Customer tier (A, B, or C)
+        conn: Optional open connection to reuse for rate lookups
 
     Returns:
         Quote dict with line_items, subtotal, fees, tax, total, and discount info
     """
-    logger.debug(f"Computing quote: {len(items)} items, {days} days, tier {tier}")
+    logger.debug("Computing quote: %d items, %s days, tier %s", len(items), days, tier)
 
+    # Money is tracked in integer cents so sums are exact and each amount is
+    # rounded once; dollars are only produced for the returned quote
     line_items = []
-    subtotal = 0.0
-    max_delivery = 0.0
+    subtotal_c = 0
+    max_delivery_c = 0
+
+    rates_by_sku = _fetch_rates_for_skus([it["sku"] for it in items], conn=conn)
 
     for it in items:
         sku = it["sku"]
         qty = int(it["quantity"])
-        rate = _fetch_rate_for_sku(sku)
-        name = _fetch_name_for_sku(sku)
-
-        unit = float(rate["daily"]) * days
-        extended = round(unit * qty, 2)
-        max_delivery = max(max_delivery, float(rate["delivery_fee_base"]))
+        rate = rates_by_sku.get(sku)
+        if not rate:
+            logger.warning(f"No rate found for SKU: {sku}")
+            raise ValueError(f"rate not found for {sku}")
+        name = rate["name"]
+        if not name:
+            logger.warning(f"No inventory item found for SKU {sku}, using SKU as name")
+            name = sku
+
+        unit_c = _to_cents(rate["daily"]) * days
+        extended_c = unit_c * qty
+        max_delivery_c = max(max_delivery_c, _to_cents(rate["delivery_fee_base"]))
 
         line_items.append(
             {
                 "sku": sku,
                 "name": name,
                 "qty": qty,  # Changed from 'quantity' to 'qty' for consistency with frontend
-                "unitPrice": round(unit, 2),  # Changed from 'unit_price' to match frontend
-                "subtotal": extended,  # Changed from 'extended' to match frontend
+                "unitPrice": unit_c / 100,  # Changed from 'unit_price' to match frontend
+                "subtotal": extended_c / 100,  # Changed from 'extended' to match frontend
             }
         )
-        subtotal += extended
+        subtotal_c += extended_c
+
+    subtotal = subtotal_c / 100
 
-    subtotal = round(subtotal, 2)
+    view = _policy_view(policies)
 
     # Apply tier discount
-    tier_discounts = policies.get("tier_discounts", {})
-    discount_pct = float(tier_discounts.get(tier, {}).get("pct", 0.0))
-    discount_amount = round(subtotal * discount_pct / 100.0, 2)
-    subtotal_after_discount = round(subtotal - discount_amount, 2)
+    discount_pct = view.tier_pct.get(tier, 0.0)
+    discount_c = _pct_of_cents(subtotal_c, discount_pct)
+    discounted_c = subtotal_c - discount_c
+    discount_amount = discount_c / 100
+    subtotal_after_discount = discounted_c / 100
 
     logger.info(
         f"Tier discount applied: {discount_pct}% for tier {tier}",
@@ -202,22 +478,20 @@ def _compute(
     fees = []
 
     # Damage waiver (applied to discounted subtotal)
-    dw_pct = float((policies.get("default_damage_waiver") or {}).get("pct", 0.0))
-    damage_waiver = round(subtotal_after_discount * dw_pct / 100.0, 2) if dw_pct else 0.0
-    if damage_waiver:
-        fees.append({"name": "Damage Waiver", "amount": damage_waiver})
+    damage_waiver_c = _pct_of_cents(discounted_c, view.damage_waiver_pct)
+    if damage_waiver_c:
+        fees.append({"name": "Damage Waiver", "amount": damage_waiver_c / 100})
 
     # Delivery fee (one fee for the whole order)
-    delivery_fee = round(max_delivery, 2) if max_delivery else 0.0
-    if delivery_fee:
-        fees.append({"name": "Delivery & Pickup", "amount": delivery_fee})
+    if max_delivery_c:
+        fees.append({"name": "Delivery & Pickup", "amount": max_delivery_c / 100})
 
     # Tax calculation (on discounted subtotal + fees)
-    taxable = subtotal_after_discount + damage_waiver + delivery_fee
-    tax_pct = float((policies.get("tax_rate") or {}).get("pct", 0.0))
-    tax = round(taxable * tax_pct / 100.0, 2) if tax_pct else 0.0
+    taxable_c = discounted_c + damage_waiver_c + max_delivery_c
+    tax_c = _pct_of_cents(taxable_c, view.tax_pct)
 
-    total = round(taxable + tax, 2)
+    tax = tax_c / 100
+    total = (taxable_c + tax_c) / 100
 
     return {
         "items": line_items,  # Changed from 'line_items' to 'items' for frontend consistency
@@ -232,6 +506,153 @@ def _compute(
     }
 
 
+# Prompt templates for the AI summary. The system prompt only varies by
+# language, so each rendering is kept after first use.
+_SUMMARY_SYSTEM_TEMPLATE = """You are a professional customer service representative for a premium rental equipment company.
+
+Generate a concise, professional explanation of this quote that:
+1. Acknowledges what the customer requested
+2. Briefly explains the equipment provided
+3. Mentions the service location for delivery
+4. Mentions tier discount if applicable (but keep it subtle and professional)
+5. If there's a location mismatch (customer mentioned one location but selected another), politely note that you'll deliver to the selected location
+6. Sounds warm, competent, and trustworthy - like a CSR from a high-end service company
+
+IMPORTANT: You MUST write your response entirely in {target_language}. Do not use English unless the target language is English.
+
+Keep it to 2-3 sentences maximum. Use professional but approachable language. Do not mention SKUs, internal codes, or technical calculation details."""
+
+_SUMMARY_USER_TEMPLATE = """Customer request: "{user_msg}"
+
+Equipment provided: {item_summary}
+Rental duration: {days} day(s)
+Customer tier: {tier_name} (tier {tier})
+Discount applied: {discount_pct}%
+Subtotal before discount: ${subtotal_before_discount:.2f}
+Final total: ${total:.2f}
+
+Location Information:
+{location_context}
+
+Remember: Write your response in {target_language}."""
+
+_SYSTEM_PROMPTS: Dict[str, str] = {}
+
+
+def _summary_system_prompt(target_language: str) -> str:
+    prompt = _SYSTEM_PROMPTS.get(target_language)
+    if prompt is None:
+        prompt = _SUMMARY_SYSTEM_TEMPLATE.format(target_language=target_language)
+        _SYSTEM_PROMPTS[target_language] = prompt
+    return prompt
+
+
+def _build_summary_prompts(
+    payload: Dict[str, Any],
+    quote: Dict[str, Any],
+    days: int,
+    tier: str,
+    resolved_loc: Any,
+    target_language: str,
+) -> tuple[str, str]:
+    """Build the system and user prompts for the AI quote summary."""
+    user_msg = payload.get("message") or "Customer rental request."
+
+    # Build item summary for AI
+    item_summary = ", ".join([f"{i['qty']}x {i['name']}" for i in quote['items'][:5]])
+    if len(quote['items']) > 5:
+        item_summary += f" (and {len(quote['items']) - 5} more items)"
+
+    tier_name = TIER_NAMES.get(tier, "Standard")
+
+    system_prompt = _summary_system_prompt(target_language)
+
+    # Build location context for AI prompt
+    location_context_parts = []
+    if resolved_loc.location_free_text:
+        location_context_parts.append(f"Customer mentioned: {resolved_loc.location_free_text}")
+    if resolved_loc.location_selected:
+        location_context_parts.append(f"Selected service location: {resolved_loc.location_selected}")
+    location_context_parts.append(f"Canonical service location for pricing: {resolved_loc.location_final}")
+    if resolved_loc.location_conflict:
+        location_context_parts.append("NOTE: Location selection overrides free-text for pricing. Please confirm with customer.")
+    location_context = "\n".join(location_context_parts)
+
+    user_prompt = _SUMMARY_USER_TEMPLATE.format_map({
+        "user_msg": user_msg,
+        "item_summary": item_summary,
+        "days": days,
+        "tier_name": tier_name,
+        "tier": tier,
+        "discount_pct": quote["discount_pct"],
+        "subtotal_before_discount": quote["subtotal_before_discount"],
+        "total": quote["total"],
+        "location_context": location_context,
+        "target_language": target_language,
+    })
+
+    return system_prompt, user_prompt
+
+
+def _generate_summary(
+    payload: Dict[str, Any],
+    quote: Dict[str, Any],
+    days: int,
+    tier: str,
+    resolved_loc: Any,
+    target_language: str,
+) -> str:
+    """Ask the model for a short customer-facing explanation of the quote."""
+    system_prompt, user_prompt = _build_summary_prompts(
+        payload, quote, days, tier, resolved_loc, target_language
+    )
+
+    # The prompts capture every input to the summary, so they are the cache key
+    key = hashlib.blake2b(
+        f"{system_prompt}\x00{user_prompt}".encode(), digest_size=16
+    ).digest()
+    now = time.monotonic()
+    with _SUMMARY_LOCK:
+        entry = _SUMMARY_CACHE.get(key)
+        if entry is not None and now - entry[0] < _SUMMARY_CACHE_TTL_S:
+            _SUMMARY_CACHE.move_to_end(key)
+            logger.debug("Using cached AI summary")
+            return entry[1]
+
+    client = _get_openai_client()
+    from openai import OpenAIError
+
+    try:
+        ai_resp = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            temperature=0.7,
+            max_tokens=_SUMMARY_MAX_TOKENS,
+        )
+    except OpenAIError as e:
+        # Re-raised as our own type so the caller need not import openai
+        raise AIServiceError(
+            f"OpenAI API error: {str(e) or type(e).__name__}", details={"error": str(e)}
+        ) from e
+    choice = ai_resp.choices[0]
+    explanation = choice.message.content.strip()
+    if getattr(choice, "finish_reason", None) == "length":
+        # Hit the token cap: drop the trailing partial sentence if there is a full one
+        cut = max(explanation.rfind(mark) for mark in _SENTENCE_ENDS)
+        if cut > 0:
+            explanation = explanation[: cut + 1]
+
+    with _SUMMARY_LOCK:
+        _SUMMARY_CACHE[key] = (now, explanation)
+        _SUMMARY_CACHE.move_to_end(key)
+        while len(_SUMMARY_CACHE) > _SUMMARY_CACHE_MAX:
+            _SUMMARY_CACHE.popitem(last=False)
+    return explanation
+
+
 def run_quote_loop(run_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
     """
     Main quote generation loop with improved parsing and tier discounts.
@@ -243,6 +664,28 @@ def run_quote_loop(run_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Quote dict with items, pricing, fees, and AI-generated notes
     """
+    # Trace steps are buffered; _run_quote_steps writes them in one batch while
+    # the AI summary is in flight, and anything still pending (e.g. when the
+    # run fails earlier) is written here
+    steps: List[Dict[str, Any]] = []
+    try:
+        return _run_quote_steps(run_id, payload, steps)
+    finally:
+        if steps:
+            # A failed trace write must not replace the quote's own exception
+            try:
+                add_step_batch(run_id, steps)
+            except SQLAlchemyError as e:
+                logger.error(
+                    f"Failed to write trace steps for run {run_id}: {str(e)}",
+                    exc_info=True,
+                    extra={"extra_fields": {"run_id": run_id, "steps": len(steps)}},
+                )
+
+
+def _run_quote_steps(
+    run_id: int, payload: Dict[str, Any], steps: List[Dict[str, Any]]
+) -> Dict[str, Any]:
     logger.info(
         f"Starting quote generation loop for run {run_id}",
         extra={
@@ -307,17 +750,20 @@ def run_quote_loop(run_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
             extra={"extra_fields": {"run_id": run_id}},
         )
 
-    # Calculate rental duration
+    # Calculate rental duration; the message is scanned for a hint only once
+    # and the result is reused for the duration note below
+    duration_hint = extract_duration_hint(msg) if msg else None
     days = _duration_days(
         payload.get("start_date"),
         payload.get("end_date"),
-        msg,
+        duration_hint,
         fallback_days=3
     )
-    logger.debug(
-        f"Calculated rental duration: {days} days for run {run_id}",
-        extra={"extra_fields": {"run_id": run_id, "days": days}},
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            f"Calculated rental duration: {days} days for run {run_id}",
+            extra={"extra_fields": {"run_id": run_id, "days": days}},
+        )
 
     # Resolve location from multiple sources
     resolved_loc = resolve_location(
@@ -338,8 +784,7 @@ def run_quote_loop(run_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
         }}
     )
 
-    add_step(
-        run_id,
+    steps.append(step_row(
         "normalize",
         {"payload": payload},
         {
@@ -349,198 +794,119 @@ def run_quote_loop(run_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
             "resolved_location": resolved_loc.model_dump(),
         },
         0,
-    )
-
-    # Fetch pricing policies
-    logger.debug(f"Fetching pricing policies for run {run_id}")
-    t1 = _now_ms()
-    try:
-        policies = _fetch_policies()
-        latency = _now_ms() - t1
-        add_step(run_id, "policies", {}, policies, latency)
-        logger.info(
-            f"Loaded pricing policies for run {run_id} ({latency}ms)",
-            extra={"extra_fields": {"run_id": run_id, "latency_ms": latency}},
-        )
-    except Exception as e:
-        logger.error(
-            f"Failed to fetch policies for run {run_id}: {str(e)}",
-            exc_info=True,
-            extra={"extra_fields": {"run_id": run_id}},
-        )
-        raise
-
-    # Compute quote with tier discounts
-    logger.debug(f"Computing quote pricing for run {run_id}")
-    t2 = _now_ms()
-    try:
-        quote = _compute(items, days, policies, tier)
-        pricing_latency = _now_ms() - t2
-        logger.info(
-            f"Quote computed for run {run_id}: subtotal=${quote.get('subtotal')}, total=${quote.get('total')}",
-            extra={
-                "extra_fields": {
-                    "run_id": run_id,
-                    "subtotal": quote.get("subtotal"),
-                    "total": quote.get("total"),
-                    "item_count": len(quote.get("items", [])),
-                    "discount_applied": quote.get("discount_amount", 0),
-                }
-            },
-        )
-    except Exception as e:
-        logger.error(
-            f"Failed to compute quote for run {run_id}: {str(e)}",
-            exc_info=True,
-            extra={"extra_fields": {"run_id": run_id}},
-        )
-        raise
+    ))
+
+    # One pooled connection for the policy and rate lookups of this quote
+    with engine.connect() as db:
+        # Fetch pricing policies
+        logger.debug("Fetching pricing policies for run %s", run_id)
+        t1 = time.perf_counter_ns()
+        try:
+            policies = _fetch_policies(db)
+            latency = (time.perf_counter_ns() - t1) // 1_000_000
+            steps.append(step_row("policies", {}, policies, latency))
+            logger.info(
+                f"Loaded pricing policies for run {run_id} ({latency}ms)",
+                extra={"extra_fields": {"run_id": run_id, "latency_ms": latency}},
+            )
+        except Exception as e:
+            logger.error(
+                f"Failed to fetch policies for run {run_id}: {str(e)}",
+                exc_info=True,
+                extra={"extra_fields": {"run_id": run_id}},
+            )
+            raise
+
+        # Compute quote with tier discounts
+        logger.debug("Computing quote pricing for run %s", run_id)
+        t2 = time.perf_counter_ns()
+        try:
+            quote = _compute(items, days, policies, tier, conn=db)
+            pricing_latency = (time.perf_counter_ns() - t2) // 1_000_000
+            logger.info(
+                f"Quote computed for run {run_id}: subtotal=${quote.get('subtotal')}, total=${quote.get('total')}",
+                extra={
+                    "extra_fields": {
+                        "run_id": run_id,
+                        "subtotal": quote.get("subtotal"),
+                        "total": quote.get("total"),
+                        "item_count": len(quote.get("items", [])),
+                        "discount_applied": quote.get("discount_amount", 0),
+                    }
+                },
+            )
+        except Exception as e:
+            logger.error(
+                f"Failed to compute quote for run {run_id}: {str(e)}",
+                exc_info=True,
+                extra={"extra_fields": {"run_id": run_id}},
+            )
+            raise
 
-    add_step(run_id, "pricing", {"items": items, "days": days}, quote, pricing_latency)
+    steps.append(step_row("pricing", {"items": items, "days": days}, quote, pricing_latency))
 
     # Apply policy guardrails
-    logger.debug(f"Applying policy guardrails for run {run_id}")
-    t3 = _now_ms()
+    logger.debug("Applying policy guardrails for run %s", run_id)
+    t3 = time.perf_counter_ns()
     if quote["subtotal"] <= 0:
         logger.error(
             f"Guardrail violation for run {run_id}: subtotal must be positive",
             extra={"extra_fields": {"run_id": run_id, "subtotal": quote["subtotal"]}},
         )
         raise ValueError("subtotal must be positive")
-    latency = _now_ms() - t3
-    add_step(run_id, "policy_guardrails", {}, quote, latency)
+    latency = (time.perf_counter_ns() - t3) // 1_000_000
+    steps.append(step_row("policy_guardrails", {}, quote, latency))
     logger.info(
         f"Policy guardrails passed for run {run_id}",
         extra={"extra_fields": {"run_id": run_id}},
     )
 
-    # Build AI-generated notes
-    notes: List[str] = []
-
-    # Language-specific labels for notes
-    LANGUAGE_LABELS = {
-        "en-US": {
-            "parsing_note": "Intelligent parsing identified {count} equipment type(s) from your request.",
-            "fallback_note": "Sample quote generated. Please specify your equipment needs for an accurate estimate.",
-            "date_note": "Rental period: {days} day(s) based on your specified dates.",
-            "duration_note": "Estimated {days}-day rental based on your request.",
-            "unmatched_note": "Note: Could not match the following items: {items}. Please verify or contact us for assistance.",
-            "ai_fallback": "Our AI quote assistant is temporarily unavailable, but your quote has been calculated accurately.",
-            "ai_error": "Quote calculated successfully. Our team is ready to assist with any questions.",
-        },
-        "es-ES": {
-            "parsing_note": "El análisis inteligente identificó {count} tipo(s) de equipo de su solicitud.",
-            "fallback_note": "Cotización de muestra generada. Especifique sus necesidades de equipo para un presupuesto preciso.",
-            "date_note": "Período de alquiler: {days} día(s) según las fechas especificadas.",
-            "duration_note": "Alquiler estimado de {days} día(s) según su solicitud.",
-            "unmatched_note": "Nota: No se pudieron encontrar los siguientes artículos: {items}. Verifique o contáctenos para asistencia.",
-            "ai_fallback": "Nuestro asistente de cotización AI no está disponible temporalmente, pero su cotización se ha calculado con precisión.",
-            "ai_error": "Cotización calculada exitosamente. Nuestro equipo está listo para ayudarle con cualquier pregunta.",
-        },
-        "ar-SA": {
-            "parsing_note": "حدد التحليل الذكي {count} نوع(أنواع) من المعدات من طلبك.",
-            "fallback_note": "تم إنشاء عرض أسعار نموذجي. يرجى تحديد احتياجاتك من المعدات للحصول على تقدير دقيق.",
-            "date_note": "فترة الإيجار: {days} يوم(أيام) بناءً على التواريخ المحددة.",
-            "duration_note": "إيجار تقديري لمدة {days} يوم(أيام) بناءً على طلبك.",
-            "unmatched_note": "ملاحظة: لم نتمكن من مطابقة العناصر التالية: {items}. يرجى التحقق أو الاتصال بنا للمساعدة.",
-            "ai_fallback": "مساعد عرض الأسعار الذكي غير متاح مؤقتًا، ولكن تم حساب عرض الأسعار الخاص بك بدقة.",
-            "ai_error": "تم حساب عرض الأسعار بنجاح. فريقنا جاهز للمساعدة في أي أسئلة.",
-        },
-        "ja-JP": {
-            "parsing_note": "インテリジェント解析により、リクエストから{count}種類の機器を特定しました。",
-            "fallback_note": "サンプル見積もりが生成されました。正確な見積もりのために機器のニーズをご指定ください。",
-            "date_note": "レンタル期間：指定された日付に基づく{days}日間。",
-            "duration_note": "リクエストに基づく推定{days}日間のレンタル。",
-            "unmatched_note": "注：以下のアイテムをマッチングできませんでした：{items}。確認するか、サポートにお問い合わせください。",
-            "ai_fallback": "AI見積もりアシスタントは一時的に利用できませんが、見積もりは正確に計算されています。",
-            "ai_error": "見積もりは正常に計算されました。ご質問がございましたら、チームがお手伝いいたします。",
-        },
-    }
-
-    # Get language-specific labels (default to English)
-    lang_key = language if language in LANGUAGE_LABELS else "en-US"
-    labels = LANGUAGE_LABELS[lang_key]
-
-    # Language name mapping for AI prompt
-    LANGUAGE_NAMES = {
-        "en-US": "English",
-        "es-ES": "Spanish",
-        "ar-SA": "Arabic",
-        "ja-JP": "Japanese",
-    }
+    # Start the AI explanation only for a quote that passed the guardrails, so
+    # the model round-trip overlaps with the trace write and note building below
     target_language = LANGUAGE_NAMES.get(language, "English")
+    logger.debug("Generating AI summary for run %s in %s", run_id, target_language)
+    summary_future = _AI_POOL.submit(
+        _generate_summary, payload, quote, days, tier, resolved_loc, target_language
+    )
 
-    # Generate professional AI explanation
-    logger.debug(f"Generating AI summary for run {run_id} in {target_language}")
+    # Write the trace so far while the model call runs. If the write fails,
+    # cancel the summary while it is still queued, and drop the rows so
+    # run_quote_loop does not retry the same batch and mask this error.
     try:
-        user_msg = payload.get("message") or "Customer rental request."
-
-        # Build item summary for AI
-        item_summary = ", ".join([f"{i['qty']}x {i['name']}" for i in quote['items'][:5]])
-        if len(quote['items']) > 5:
-            item_summary += f" (and {len(quote['items']) - 5} more items)"
-
-        tier_names = {"A": "Premium", "B": "Corporate", "C": "Standard"}
-        tier_name = tier_names.get(tier, "Standard")
-
-        system_prompt = f"""You are a professional customer service representative for a premium rental equipment company.
-
-Generate a concise, professional explanation of this quote that:
-1. Acknowledges what the customer requested
-2. Briefly explains the equipment provided
-3. Mentions the service location for delivery
-4. Mentions tier discount if applicable (but keep it subtle and professional)
-5. If there's a location mismatch (customer mentioned one location but selected another), politely note that you'll deliver to the selected location
-6. Sounds warm, competent, and trustworthy - like a CSR from a high-end service company
-
-IMPORTANT: You MUST write your response entirely in {target_language}. Do not use English unless the target language is English.
-
-Keep it to 2-3 sentences maximum. Use professional but approachable language. Do not mention SKUs, internal codes, or technical calculation details."""
-
-        # Build location context for AI prompt
-        location_context_parts = []
-        if resolved_loc.location_free_text:
-            location_context_parts.append(f"Customer mentioned: {resolved_loc.location_free_text}")
-        if resolved_loc.location_selected:
-            location_context_parts.append(f"Selected service location: {resolved_loc.location_selected}")
-        location_context_parts.append(f"Canonical service location for pricing: {resolved_loc.location_final}")
-        if resolved_loc.location_conflict:
-            location_context_parts.append("NOTE: Location selection overrides free-text for pricing. Please confirm with customer.")
-        location_context = "\n".join(location_context_parts)
-
-        user_prompt = f"""Customer request: "{user_msg}"
-
-Equipment provided: {item_summary}
-Rental duration: {days} day(s)
-Customer tier: {tier_name} (tier {tier})
-Discount applied: {quote['discount_pct']}%
-Subtotal before discount: ${quote['subtotal_before_discount']:.2f}
-Final total: ${quote['total']:.2f}
+        add_step_batch(run_id, steps)
+    except Exception:
+        summary_future.cancel()
+        raise
+    finally:
+        steps.clear()
 
-Location Information:
-{location_context}
+    # Build AI-generated notes
+    notes: List[str] = []
 
-Remember: Write your response in {target_language}."""
+    # Get language-specific labels (default to English)
+    labels = LANGUAGE_LABELS.get(language, LANGUAGE_LABELS["en-US"])
 
-        ai_resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0.7,
-            max_tokens=200,
-        )
-        explanation = ai_resp.choices[0].message.content.strip()
+    # Collect the AI explanation started after the guardrails
+    try:
+        explanation = summary_future.result(timeout=_AI_SUMMARY_TIMEOUT_S)
         notes.append(explanation)
 
         logger.info(
             f"Generated AI summary for run {run_id} in {target_language}",
             extra={"extra_fields": {"run_id": run_id, "summary_length": len(explanation), "language": language}},
         )
-    except OpenAIError as e:
+    except FuturesTimeout:
+        # Only drops a call still queued for a worker; one already running
+        # ends on its own within the client's request timeout
+        summary_future.cancel()
+        logger.warning(
+            f"AI summary for run {run_id} timed out after {_AI_SUMMARY_TIMEOUT_S}s",
+            extra={"extra_fields": {"run_id": run_id, "timeout_s": _AI_SUMMARY_TIMEOUT_S}},
+        )
+        notes.append(labels["ai_fallback"])
+    except AIServiceError as e:
         logger.error(
-            f"OpenAI API error generating summary for run {run_id}: {str(e)}",
+            f"Error generating AI summary for run {run_id}: {str(e)}",
             exc_info=True,
             extra={"extra_fields": {"run_id": run_id}},
         )
@@ -567,10 +933,8 @@ Remember: Write your response in {target_language}."""
     # Add duration note
     if payload.get("start_date") and payload.get("end_date"):
         notes.append(labels["date_note"].format(days=days))
-    else:
-        duration_hint = extract_duration_hint(msg) if msg else None
-        if duration_hint:
-            notes.append(labels["duration_note"].format(days=days))
+    elif duration_hint:
+        notes.append(labels["duration_note"].format(days=days))
 
     quote["notes"] = notes
 
@@ -11,9 +11,17 @@ Key features:
 - Returns unmatched items for transparency
 """
 from __future__ import annotations
+import logging
 import re
-from typing import List, Dict, Any, Tuple, Optional
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Dict, Any, FrozenSet, Iterable, Tuple, Optional
 from difflib import SequenceMatcher
+
+try:
+    from rapidfuzz import fuzz as _rf_fuzz, process as _rf_process
+except ImportError:  # optional: only used to prune the fuzzy pass
+    _rf_fuzz = _rf_process = None
 from backend.core.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -324,12 +332,46 @@ WORD_NUMBERS = {
     "hundred": 100,
 }
 
+# Text normalization patterns (input is already lowercased)
+# Group 2 is set for inch spellings; otherwise the match is a foot spelling
+_RE_SIZE_UNIT = re.compile(r'(\d+)(?:(["\u201d\u201c]|-inch|in\b)|-foot|\s*ft\b)')
+_RE_WS = re.compile(r'\s+')
+
+# Quantity and line-item patterns
+_RE_QTY = re.compile(r'(?:qty[:\s]*)?(\d+)|(\d+)x')
+_RE_PREFIX = re.compile(
+    r'^(?:i\s+)?(?:need|want|require|looking\s+for|give\s+me|get\s+me|get|send|order)\s+',
+    re.IGNORECASE,
+)
+_RE_QTY_PREFIX = re.compile(r'^qty[:\s]*(\d+)\s+(.+)$', re.IGNORECASE)
+_RE_NX = re.compile(r'^(\d+)x\s+(.+)$', re.IGNORECASE)
+_RE_SIZE = re.compile(r'^(\d+)\s+(\d+)\s*(inch|foot|ft|in)?\s*(.+)$', re.IGNORECASE)
+_RE_NUM = re.compile(r'^(\d+)\s+(.+)$')
+
+# Duration hint patterns, combined so the message is scanned once. Each
+# alternative sets exactly one named group (read back via Match.lastgroup).
+# IGNORECASE lets it run on the raw message without a lowered copy.
+_RE_DURATION = re.compile(
+    r'\b(?P<days>\d+)[\s-]*days?\b'
+    r'|(?P<fri_sun>friday\s+(?:through|thru|to|-)\s+sunday)'
+    r'|\b(?P<weekend>weekend)\b'
+    r'|\b(?:a|one)\s+(?P<week>week)\b'
+    r'|\b(?P<month>month)\b',
+    re.IGNORECASE,
+)
+# Keyword hints in priority order; an explicit "N days" always wins.
+_DURATION_KEYWORDS = (("fri_sun", 3), ("weekend", 3), ("week", 7), ("month", 30))
+
 
 def similarity(a: str, b: str) -> float:
     """Calculate string similarity ratio (0.0 to 1.0)"""
     return SequenceMatcher(None, a.lower(), b.lower()).ratio()
 
 
+def _size_unit_repl(m: re.Match) -> str:
+    return m.group(1) + (" inch" if m.group(2) else " foot")
+
+
 def normalize_text(text: str) -> str:
     """
     Normalize text for better matching.
@@ -340,18 +382,12 @@ def normalize_text(text: str) -> str:
     """
     text = text.lower().strip()
 
-    # Normalize inch patterns: 60-inch, 60", 60in -> 60 inch
-    text = re.sub(r'(\d+)["\u201d\u201c]', r'\1 inch', text)  # 60" -> 60 inch
-    text = re.sub(r'(\d+)-inch', r'\1 inch', text)  # 60-inch -> 60 inch
-    text = re.sub(r'(\d+)in\b', r'\1 inch', text)  # 60in -> 60 inch
-
-    # Normalize foot patterns: 8-foot, 8ft -> 8 foot
-    text = re.sub(r'(\d+)-foot', r'\1 foot', text)  # 8-foot -> 8 foot
-    text = re.sub(r'(\d+)ft\b', r'\1 foot', text)  # 8ft -> 8 foot
-    text = re.sub(r'(\d+)\s*ft\b', r'\1 foot', text)  # 8 ft -> 8 foot
+    # Normalize size units in one pass: 60-inch, 60", 60in -> 60 inch;
+    # 8-foot, 8ft, 8 ft -> 8 foot
+    text = _RE_SIZE_UNIT.sub(_size_unit_repl, text)
 
     # Clean up extra spaces
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = _RE_WS.sub(' ', text).strip()
 
     return text
 
@@ -363,21 +399,10 @@ def parse_quantity(text: str) -> Optional[int]:
     """
     text_lower = text.lower().strip()
 
-    # Handle "5x" format
-    x_match = re.match(r'^(\d+)x$', text_lower)
-    if x_match:
-        return int(x_match.group(1))
-
-    # Handle "qty 5" or "qty: 5" format
-    qty_match = re.match(r'^qty[:\s]*(\d+)$', text_lower)
-    if qty_match:
-        return int(qty_match.group(1))
-
-    # Try direct number conversion first
-    try:
-        return int(text_lower)
-    except ValueError:
-        pass
+    # "50", "5x", "qty 5" or "qty: 5" in one match
+    num_match = _RE_QTY.fullmatch(text_lower)
+    if num_match:
+        return int(num_match.group(1) or num_match.group(2))
 
     # Try word-based numbers
     if text_lower in WORD_NUMBERS:
@@ -391,6 +416,99 @@ def parse_quantity(text: str) -> Optional[int]:
     return None
 
 
+# Synonym -> its SKU; every ITEM_SYNONYMS entry lists exactly one SKU
+_SYNONYM_TO_SKU: Dict[str, str] = {synonym: skus[0] for synonym, skus in ITEM_SYNONYMS.items()}
+
+# (normalized synonym, synonym, sku) in table order, normalized once at import
+# rather than on every lookup.
+_NORMALIZED_SYNONYMS: List[Tuple[str, str, str]] = [
+    (normalize_text(synonym), synonym, sku)
+    for synonym, sku in _SYNONYM_TO_SKU.items()
+]
+
+# Synonyms that normalize_text leaves unchanged; a lowercased item equal to one
+# of these is an exact match without running the normalization regexes.
+_CANONICAL_SYNONYMS: FrozenSet[str] = frozenset(
+    synonym for normalized, synonym, _sku in _NORMALIZED_SYNONYMS if normalized == synonym
+)
+
+# Parallel columns of the same table for the fuzzy pass: rapidfuzz takes the
+# keys as one sequence and results map back to SKUs by index.
+_FUZZY_KEYS: Tuple[str, ...] = tuple(normalized for normalized, _synonym, _sku in _NORMALIZED_SYNONYMS)
+_FUZZY_SKUS: Tuple[str, ...] = tuple(sku for _normalized, _synonym, sku in _NORMALIZED_SYNONYMS)
+
+# Synonyms for the substring pass, longest (most specific) first. The sort is
+# stable so equal-length synonyms keep table order.
+_SUBSTRING_SYNONYMS: List[Tuple[str, str, str]] = sorted(
+    _NORMALIZED_SYNONYMS, key=lambda entry: len(entry[1]), reverse=True
+)
+
+
+def _build_synonym_automaton():
+    """
+    Build an Aho-Corasick automaton over the normalized synonyms, or return
+    None when pyahocorasick is not installed. Each key carries its rank in
+    _SUBSTRING_SYNONYMS so the scan picks the same synonym as the linear pass.
+    """
+    try:
+        import ahocorasick
+    except ImportError:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for rank, (normalized, synonym, sku) in enumerate(_SUBSTRING_SYNONYMS):
+        # Several spellings can normalize to the same key; keep the best-ranked
+        if normalized not in automaton:
+            automaton.add_word(normalized, (rank, synonym, sku))
+    automaton.make_automaton()
+    return automaton
+
+
+_SYNONYM_AUTOMATON = _build_synonym_automaton()
+
+
+def _longest_synonym_in(item_normalized: str) -> Optional[Tuple[str, str]]:
+    """Return (synonym, sku) for the most specific synonym contained in the text."""
+    if _SYNONYM_AUTOMATON is not None:
+        best = None
+        for _end, payload in _SYNONYM_AUTOMATON.iter(item_normalized):
+            if best is None or payload[0] < best[0]:
+                best = payload
+        return (best[1], best[2]) if best is not None else None
+
+    for normalized, synonym, sku in _SUBSTRING_SYNONYMS:
+        if normalized in item_normalized:
+            return (synonym, sku)
+    return None
+
+
+def _fuzzy_candidates(item_normalized: str, min_similarity: float) -> Iterable[Tuple[str, str]]:
+    """
+    Synonyms (normalized, sku) worth scoring in the fuzzy pass, in table order.
+
+    With rapidfuzz installed, one batched call computes fuzz.ratio for every
+    synonym. That is the LCS-based ratio, which is never below the
+    SequenceMatcher ratio, so synonyms under the cutoff are dropped without
+    changing which synonym similarity() ends up picking.
+    """
+    if _rf_process is None:
+        return zip(_FUZZY_KEYS, _FUZZY_SKUS)
+
+    hits = _rf_process.extract(
+        item_normalized,
+        _FUZZY_KEYS,
+        scorer=_rf_fuzz.ratio,
+        limit=None,
+        # small slack so float rounding never drops an exact tie
+        score_cutoff=max(0.0, min_similarity * 100 - 1e-6),
+    )
+    return [
+        (_FUZZY_KEYS[idx], _FUZZY_SKUS[idx])
+        for idx in sorted(idx for _key, _score, idx in hits)
+    ]
+
+
+@lru_cache(maxsize=4096)
 def find_matching_sku(item_text: str, min_similarity: float = 0.55) -> Tuple[Optional[str], float]:
     """
     Find the best matching SKU for an item description using exact and fuzzy matching.
@@ -401,6 +519,9 @@ def find_matching_sku(item_text: str, min_similarity: float = 0.55) -> Tuple[Opt
     3. Try longest-substring match (prioritize more specific synonyms)
     4. Fall back to fuzzy matching
 
+    The lookup is pure, so results are memoized per (item_text, min_similarity);
+    common item names skip the whole cascade after the first request.
+
     Args:
         item_text: The item description from customer message
         min_similarity: Minimum similarity threshold (0.0 to 1.0)
@@ -408,46 +529,69 @@ def find_matching_sku(item_text: str, min_similarity: float = 0.55) -> Tuple[Opt
     Returns:
         Tuple of (SKU, confidence_score) or (None, 0.0) if no match
     """
-    item_normalized = normalize_text(item_text)
+    # Most item names are already a canonical synonym once lowercased, in
+    # which case normalizing cannot change them
+    item_lower = item_text.lower().strip()
+    if item_lower in _CANONICAL_SYNONYMS:
+        sku = _SYNONYM_TO_SKU[item_lower]
+        logger.debug("Exact match: '%s' -> %s", item_text, sku)
+        return (sku, 1.0)
+
+    item_normalized = normalize_text(item_lower)
 
     # First try exact match with normalized text
-    if item_normalized in ITEM_SYNONYMS:
-        sku = ITEM_SYNONYMS[item_normalized][0]
-        logger.debug(f"Exact match: '{item_text}' -> {sku}")
+    sku = _SYNONYM_TO_SKU.get(item_normalized)
+    if sku is not None:
+        logger.debug("Exact match: '%s' -> %s", item_text, sku)
         return (sku, 1.0)
 
     # Try to find the longest matching synonym (most specific)
-    # Sort synonyms by length descending to prioritize longer/more specific matches
-    sorted_synonyms = sorted(ITEM_SYNONYMS.keys(), key=len, reverse=True)
-
-    for synonym in sorted_synonyms:
-        synonym_normalized = normalize_text(synonym)
-        # Check if the synonym is contained in the item text
-        if synonym_normalized in item_normalized:
-            sku = ITEM_SYNONYMS[synonym][0]
-            # Higher confidence for longer matches
-            confidence = min(1.0, 0.85 + (len(synonym) / 50))
-            logger.debug(f"Substring match: '{item_text}' contains '{synonym}' -> {sku}")
-            return (sku, confidence)
+    match = _longest_synonym_in(item_normalized)
+    if match is not None:
+        synonym, sku = match
+        # Higher confidence for longer matches
+        confidence = min(1.0, 0.85 + (len(synonym) / 50))
+        logger.debug("Substring match: '%s' contains '%s' -> %s", item_text, synonym, sku)
+        return (sku, confidence)
 
     # Try fuzzy matching against all synonyms
     best_match = None
     best_score = 0.0
 
-    for synonym, skus in ITEM_SYNONYMS.items():
-        score = similarity(item_normalized, normalize_text(synonym))
+    for synonym_normalized, sku in _fuzzy_candidates(item_normalized, min_similarity):
+        # Both sides are already lowercase, so skip similarity()'s lower() copies
+        score = SequenceMatcher(None, item_normalized, synonym_normalized).ratio()
         if score > best_score and score >= min_similarity:
             best_score = score
-            best_match = skus[0]
+            best_match = sku
 
     if best_match:
-        logger.debug(f"Fuzzy match: '{item_text}' -> {best_match} (score: {best_score:.2f})")
+        logger.debug("Fuzzy match: '%s' -> %s (score: %.2f)", item_text, best_match, best_score)
     else:
-        logger.debug(f"No match found for: '{item_text}' (best score: {best_score:.2f})")
+        logger.debug("No match found for: '%s' (best score: %.2f)", item_text, best_score)
 
     return (best_match, best_score)
 
 
+@dataclass(slots=True)
+class LineItem:
+    """One quantity + item name parsed from a message segment."""
+
+    qty: int
+    normalized_name: str
+    raw_text: str
+    size: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Dict form returned by extract_line_items."""
+        return {
+            "qty": self.qty,
+            "normalizedName": self.normalized_name,
+            "rawText": self.raw_text,
+            "attributes": {"size": self.size} if self.size is not None else {},
+        }
+
+
 def extract_line_items(text: str) -> List[Dict[str, Any]]:
     """
     Extract line items from natural language text.
@@ -466,21 +610,26 @@ def extract_line_items(text: str) -> List[Dict[str, Any]]:
     Returns:
         List of dicts with 'qty', 'normalizedName', 'rawText', and 'attributes'
     """
-    logger.info(f"Extracting line items from: {text[:100]}...")
+    return [item.to_dict() for item in _extract_line_items(text)]
+
+
+def _extract_line_items(text: str) -> List[LineItem]:
+    """extract_line_items without the dict conversion, for parse_items_from_message."""
+    logger.info("Extracting line items from: %.100s...", text)
 
     # Normalize the entire text first
     text_normalized = normalize_text(text)
 
     # Strip common prefix words that don't add meaning
     # (need, want, get, require, looking for, etc.)
-    prefix_pattern = r'^(?:i\s+)?(?:need|want|require|looking\s+for|give\s+me|get\s+me|get|send|order)\s+'
-    text_normalized = re.sub(prefix_pattern, '', text_normalized, flags=re.IGNORECASE)
+    text_normalized = _RE_PREFIX.sub('', text_normalized)
 
     line_items = []
 
     # Split by common separators: "and", ",", ";"
-    # But be careful not to split on "and" within item names
-    segments = re.split(r'\s*(?:,|;)\s*|\s+and\s+', text_normalized)
+    # But be careful not to split on "and" within item names. Whitespace is
+    # already collapsed to single spaces, so plain string replaces suffice.
+    segments = text_normalized.replace(";", ",").replace(" and ", ",").split(",")
 
     for segment in segments:
         segment = segment.strip()
@@ -488,7 +637,7 @@ def extract_line_items(text: str) -> List[Dict[str, Any]]:
             continue
 
         # Also strip prefix words from each segment
-        segment = re.sub(prefix_pattern, '', segment, flags=re.IGNORECASE).strip()
+        segment = _RE_PREFIX.sub('', segment).strip()
         if not segment:
             continue
 
@@ -502,11 +651,11 @@ def extract_line_items(text: str) -> List[Dict[str, Any]]:
         if item:
             line_items.append(item)
 
-    logger.info(f"Extracted {len(line_items)} line items")
+    logger.info("Extracted %d line items", len(line_items))
     return line_items
 
 
-def _parse_single_segment(segment: str) -> Optional[Dict[str, Any]]:
+def _parse_single_segment(segment: str) -> Optional[LineItem]:
     """
     Parse a single segment to extract quantity and item name.
 
@@ -524,62 +673,63 @@ def _parse_single_segment(segment: str) -> Optional[Dict[str, Any]]:
     qty = 1
     item_name = segment
 
-    # Pattern 1: "qty N item" or "qty: N item"
-    qty_prefix = re.match(r'^qty[:\s]*(\d+)\s+(.+)$', segment, re.IGNORECASE)
-    if qty_prefix:
-        qty = int(qty_prefix.group(1))
-        item_name = qty_prefix.group(2).strip()
-        return {"qty": qty, "normalizedName": item_name, "rawText": segment, "attributes": {}}
-
-    # Pattern 2: "Nx item" (e.g., "5x chairs")
-    nx_pattern = re.match(r'^(\d+)x\s+(.+)$', segment, re.IGNORECASE)
-    if nx_pattern:
-        qty = int(nx_pattern.group(1))
-        item_name = nx_pattern.group(2).strip()
-        return {"qty": qty, "normalizedName": item_name, "rawText": segment, "attributes": {}}
-
-    # Pattern 3: "N size-spec item" (e.g., "5 60 inch round tables", "5 60-inch tables")
-    # This handles the tricky case where there are two numbers
-    size_pattern = re.match(r'^(\d+)\s+(\d+)\s*(inch|foot|ft|in)?\s*(.+)$', segment, re.IGNORECASE)
-    if size_pattern:
-        qty = int(size_pattern.group(1))
-        size_num = size_pattern.group(2)
-        size_unit = size_pattern.group(3) or "inch"
-        rest = size_pattern.group(4).strip()
-        # Normalize the size unit
-        if size_unit.lower() in ["in"]:
-            size_unit = "inch"
-        elif size_unit.lower() in ["ft"]:
-            size_unit = "foot"
-        item_name = f"{size_num} {size_unit} {rest}"
-        return {"qty": qty, "normalizedName": item_name, "rawText": segment, "attributes": {"size": f"{size_num}{size_unit}"}}
-
-    # Pattern 4: "N item" where N is a number (e.g., "50 chairs")
-    num_pattern = re.match(r'^(\d+)\s+(.+)$', segment)
-    if num_pattern:
-        qty = int(num_pattern.group(1))
-        item_name = num_pattern.group(2).strip()
-        return {"qty": qty, "normalizedName": item_name, "rawText": segment, "attributes": {}}
-
-    # Pattern 5: "a/an WORD_NUMBER item" (e.g., "a dozen tables", "a hundred chairs")
-    # MUST come before simple word number pattern to avoid "a" being treated as qty 1
-    compound_pattern = r'^(a|an)\s+(' + '|'.join(k for k in WORD_NUMBERS.keys() if k not in ['a', 'an']) + r')\s+(.+)$'
-    compound_match = re.match(compound_pattern, segment, re.IGNORECASE)
-    if compound_match:
-        qty = WORD_NUMBERS.get(compound_match.group(2).lower(), 1)
-        item_name = compound_match.group(3).strip()
-        return {"qty": qty, "normalizedName": item_name, "rawText": segment, "attributes": {}}
-
-    # Pattern 6: Word number + item (e.g., "ten speakers", "five chairs")
-    word_num_pattern = r'^(' + '|'.join(WORD_NUMBERS.keys()) + r')\s+(.+)$'
-    word_match = re.match(word_num_pattern, segment, re.IGNORECASE)
-    if word_match:
-        qty = WORD_NUMBERS.get(word_match.group(1).lower(), 1)
-        item_name = word_match.group(2).strip()
-        return {"qty": qty, "normalizedName": item_name, "rawText": segment, "attributes": {}}
+    # Every pattern is anchored, and only patterns 2-4 can start with a digit,
+    # so the first character picks which group to try.
+    if segment[0].isdigit():
+        # Pattern 2: "Nx item" (e.g., "5x chairs")
+        nx_pattern = _RE_NX.match(segment)
+        if nx_pattern:
+            qty = int(nx_pattern.group(1))
+            item_name = nx_pattern.group(2).strip()
+            return LineItem(qty, item_name, segment)
+
+        # Pattern 3: "N size-spec item" (e.g., "5 60 inch round tables", "5 60-inch tables")
+        # This handles the tricky case where there are two numbers
+        size_pattern = _RE_SIZE.match(segment)
+        if size_pattern:
+            qty = int(size_pattern.group(1))
+            size_num = size_pattern.group(2)
+            size_unit = size_pattern.group(3) or "inch"
+            rest = size_pattern.group(4).strip()
+            # Normalize the size unit
+            if size_unit.lower() in ["in"]:
+                size_unit = "inch"
+            elif size_unit.lower() in ["ft"]:
+                size_unit = "foot"
+            item_name = f"{size_num} {size_unit} {rest}"
+            return LineItem(qty, item_name, segment, size=f"{size_num}{size_unit}")
+
+        # Pattern 4: "N item" where N is a number (e.g., "50 chairs")
+        num_pattern = _RE_NUM.match(segment)
+        if num_pattern:
+            qty = int(num_pattern.group(1))
+            item_name = num_pattern.group(2).strip()
+            return LineItem(qty, item_name, segment)
+    else:
+        # Pattern 1: "qty N item" or "qty: N item"
+        qty_prefix = _RE_QTY_PREFIX.match(segment)
+        if qty_prefix:
+            qty = int(qty_prefix.group(1))
+            item_name = qty_prefix.group(2).strip()
+            return LineItem(qty, item_name, segment)
+
+        # Patterns 5 and 6 are plain word lookups on the leading tokens
+        parts = segment.split(None, 1)
+        first = parts[0].lower()
+        if len(parts) == 2 and first in WORD_NUMBERS:
+            # Pattern 5: "a/an WORD_NUMBER item" (e.g., "a dozen tables", "a hundred chairs")
+            # MUST come before simple word number pattern to avoid "a" being treated as qty 1
+            if first in ("a", "an"):
+                rest = parts[1].split(None, 1)
+                word = rest[0].lower()
+                if len(rest) == 2 and word in WORD_NUMBERS and word not in ("a", "an"):
+                    return LineItem(WORD_NUMBERS[word], rest[1].strip(), segment)
+
+            # Pattern 6: Word number + item (e.g., "ten speakers", "five chairs")
+            return LineItem(WORD_NUMBERS[first], parts[1].strip(), segment)
 
     # No quantity found, assume 1
-    return {"qty": 1, "normalizedName": item_name, "rawText": segment, "attributes": {}}
+    return LineItem(1, item_name, segment)
 
 
 def parse_items_from_message(message: str) -> List[Dict[str, Any]]:
@@ -604,16 +754,16 @@ def parse_items_from_message(message: str) -> List[Dict[str, Any]]:
         List of dicts with 'sku', 'quantity', 'confidence', and 'source' keys.
         Items that couldn't be matched have sku=None and are flagged as unmatched.
     """
-    logger.info(f"Parsing items from message: {message[:100]}...")
+    logger.info("Parsing items from message: %.100s...", message)
 
     # Step 1: Extract line items
-    line_items = extract_line_items(message)
+    line_items = _extract_line_items(message)
 
     # Step 2: Match each line item to SKU
     items = []
     for line_item in line_items:
-        qty = line_item["qty"]
-        name = line_item["normalizedName"]
+        qty = line_item.qty
+        name = line_item.normalized_name
 
         sku, confidence = find_matching_sku(name)
 
@@ -622,7 +772,7 @@ def parse_items_from_message(message: str) -> List[Dict[str, Any]]:
                 "sku": sku,
                 "quantity": qty,
                 "confidence": confidence,
-                "source": line_item["rawText"],
+                "source": line_item.raw_text,
                 "matched": True
             })
         else:
@@ -631,34 +781,31 @@ def parse_items_from_message(message: str) -> List[Dict[str, Any]]:
                 "sku": None,
                 "quantity": qty,
                 "confidence": 0.0,
-                "source": line_item["rawText"],
+                "source": line_item.raw_text,
                 "matched": False,
                 "unmatched_name": name
             })
 
-    # Remove duplicates (same SKU), keeping the one with highest confidence
-    seen_skus = {}
-    unique_items = []
-    for item in items:
-        sku = item["sku"]
-        if sku is None:
-            unique_items.append(item)
-        elif sku not in seen_skus:
-            seen_skus[sku] = len(unique_items)
-            unique_items.append(item)
-        else:
-            # If we've seen this SKU, keep the one with higher confidence/quantity
-            existing_idx = seen_skus[sku]
-            if item["confidence"] > unique_items[existing_idx]["confidence"]:
-                unique_items[existing_idx] = item
-
-    logger.info(
-        f"Parsed {len(unique_items)} items from message",
-        extra={"extra_fields": {
-            "item_count": len(unique_items),
-            "items": [{"sku": i["sku"], "qty": i["quantity"], "conf": i["confidence"], "matched": i.get("matched", True)} for i in unique_items]
-        }}
-    )
+    # Remove duplicates (same SKU), keeping the one with highest confidence.
+    # Replacing a dict value keeps its original position, and unmatched items
+    # get their own index key, so the output order is first-seen order.
+    best: Dict[Any, Dict[str, Any]] = {}
+    for idx, item in enumerate(items):
+        key = item["sku"] if item["sku"] is not None else idx
+        existing = best.get(key)
+        if existing is None or item["confidence"] > existing["confidence"]:
+            best[key] = item
+    unique_items = list(best.values())
+
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "Parsed %d items from message",
+            len(unique_items),
+            extra={"extra_fields": {
+                "item_count": len(unique_items),
+                "items": [{"sku": i["sku"], "qty": i["quantity"], "conf": i["confidence"], "matched": i.get("matched", True)} for i in unique_items]
+            }}
+        )
 
     return unique_items
 
@@ -677,27 +824,19 @@ def extract_duration_hint(message: str) -> Optional[int]:
     Returns:
         Number of days or None if not found
     """
-    message_lower = message.lower()
-
-    # Pattern: "for N days" or "N day rental"
-    day_match = re.search(r'\b(\d+)\s*days?\b', message_lower)
-    if day_match:
-        return int(day_match.group(1))
-
-    # Pattern: "friday through sunday" or similar
-    if re.search(r'friday\s+(?:through|thru|to|-)\s+sunday', message_lower):
-        return 3
-
-    # Pattern: "weekend" or "for the weekend"
-    if re.search(r'\bweekend\b', message_lower):
-        return 3
-
-    # Pattern: "week" or "for a week"
-    if re.search(r'\b(?:a|one)\s+week\b', message_lower):
-        return 7
+    if not message:
+        return None
 
-    # Pattern: "month"
-    if re.search(r'\bmonth\b', message_lower):
-        return 30
+    # Patterns: "for N days" / "N day rental", "friday through sunday",
+    # "weekend", "a week", "month"
+    found = set()
+    for match in _RE_DURATION.finditer(message):
+        if match.lastgroup == "days":
+            return int(match.group("days"))
+        found.add(match.lastgroup)
+
+    for kind, days in _DURATION_KEYWORDS:
+        if kind in found:
+            return days
 
     return None
@@ -1,24 +1,43 @@
 # backend/core/llm.py
 import os
-import json
+import threading
 from typing import Any, Dict, Optional, List
 
+import orjson
+
+# Clients are shared per process so every LLMClient reuses one keep-alive
+# connection pool instead of each opening their own.
+_CLIENTS: Dict[str, Any] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _get_client(provider: str) -> Any:
+    """Return the process-wide client for provider, creating it on first use."""
+    client = _CLIENTS.get(provider)
+    if client is not None:
+        return client
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(provider)
+        if client is None:
+            if provider == "openai":
+                from openai import OpenAI
+
+                client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+            elif provider == "anthropic":
+                import anthropic
+
+                client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+            else:
+                raise ValueError(f"Unsupported LLM_PROVIDER: {provider}")
+            _CLIENTS[provider] = client
+    return client
+
 
 class LLMClient:
     def __init__(self):
         self.provider = os.getenv("LLM_PROVIDER", "openai").lower()
         self.model = os.getenv("LLM_MODEL", "gpt-4o-mini")
-
-        if self.provider == "openai":
-            from openai import OpenAI
-
-            self._client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        elif self.provider == "anthropic":
-            import anthropic
-
-            self._client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-        else:
-            raise ValueError(f"Unsupported LLM_PROVIDER: {self.provider}")
+        self._client = _get_client(self.provider)
 
     def json_chat(
         self, system: str, user: str, json_schema: Optional[Dict] = None
@@ -28,7 +47,9 @@ class LLMClient:
         Fallback to parseable JSON with guardrails.
         """
         if self.provider == "openai":
-            # Uses response_format="json_object" for strict JSON
+            # Uses response_format="json_object" for strict JSON. The system
+            # message goes first and carries no per-request data, so OpenAI's
+            # automatic prefix caching applies to it.
             resp = self._client.chat.completions.create(
                 model=self.model,
                 messages=[
@@ -39,22 +60,30 @@ class LLMClient:
                 temperature=0.2,
             )
             content = resp.choices[0].message.content
-            return json.loads(content)
+            return orjson.loads(content)
 
         elif self.provider == "anthropic":
-            # Anthropic: ask for JSON via instructions + delimiter
+            # Anthropic: ask for JSON via instructions + delimiter. The system
+            # block is marked cacheable so repeated calls reuse the prompt prefix
+            # (prompts under the provider's minimum length are just not cached).
             msg = self._client.messages.create(
                 model=self.model,
                 max_tokens=1024,
                 temperature=0.2,
-                system=system + "\nReturn ONLY valid JSON with no commentary.",
+                system=[
+                    {
+                        "type": "text",
+                        "text": system + "\nReturn ONLY valid JSON with no commentary.",
+                        "cache_control": {"type": "ephemeral"},
+                    }
+                ],
                 messages=[{"role": "user", "content": user}],
             )
             text = "".join(
                 [b.text for b in msg.content if getattr(b, "type", "") == "text"]
             )
             # best-effort JSON parse (could add a small fixer if needed)
-            return json.loads(text)
+            return orjson.loads(text)
 
     def tool_choice(
         self, system: str, user: str, tools: List[Dict[str, Any]]
@@ -80,7 +109,7 @@ class LLMClient:
                 tc = msg.tool_calls[0]
                 return {
                     "name": tc.function.name,
-                    "arguments": json.loads(tc.function.arguments),
+                    "arguments": orjson.loads(tc.function.arguments),
                 }
             # default noop
             return {"name": None, "arguments": {}}
@@ -13,10 +13,17 @@ detects conflicts between the sources.
 """
 
 from __future__ import annotations
+import logging
 import re
+from functools import lru_cache
 from typing import Optional, Dict, Any, List, Tuple
 from difflib import SequenceMatcher
 
+try:
+    from rapidfuzz import fuzz as _rf_fuzz
+except ImportError:  # optional: only used to skip hopeless fuzzy comparisons
+    _rf_fuzz = None
+
 from backend.core.logging_config import get_logger
 from backend.models import ResolvedLocation, ServiceLocationMeta
 
@@ -31,14 +38,138 @@ KNOWN_LOCATIONS: Dict[str, List[str]] = {
     "Southlake, TX": ["southlake", "southlake tx", "southlake, tx"],
 }
 
-# Location keywords/patterns to extract from free text
+# Location keywords/patterns to extract from free text.
+# Word runs are length-bounded and the "[,] tx" suffix has a single way to
+# match, so a long or adversarial message cannot trigger heavy backtracking.
 LOCATION_PATTERNS = [
-    r'\b(dallas|fort\s*worth|plano|arlington|southlake)(?:\s*,?\s*(?:tx|texas))?\b',
-    r'\b(austin|houston|san\s*antonio)(?:\s*,?\s*(?:tx|texas))?\b',
-    r'\bin\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?(?:,\s*[A-Z]{2})?)\b',
-    r'\bat\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?(?:,\s*[A-Z]{2})?)\b',
-    r'\bnear\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?(?:,\s*[A-Z]{2})?)\b',
+    r'\b(dallas|fort\s*worth|plano|arlington|southlake)(?:\s*(?:,\s*)?(?:tx|texas))?\b',
+    r'\b(austin|houston|san\s*antonio)(?:\s*(?:,\s*)?(?:tx|texas))?\b',
+    r'\bin\s+([A-Z][a-z]{1,39}(?:\s+[A-Z][a-z]{1,39})?(?:,\s*[A-Z]{2})?)\b',
+    r'\bat\s+([A-Z][a-z]{1,39}(?:\s+[A-Z][a-z]{1,39})?(?:,\s*[A-Z]{2})?)\b',
+    r'\bnear\s+([A-Z][a-z]{1,39}(?:\s+[A-Z][a-z]{1,39})?(?:,\s*[A-Z]{2})?)\b',
 ]
+_LOCATION_REGEXES = [re.compile(p, re.IGNORECASE) for p in LOCATION_PATTERNS]
+
+
+def _build_alias_index() -> Dict[str, str]:
+    """Map each lowercase alias and canonical name to its canonical location."""
+    index: Dict[str, str] = {}
+    for canonical, aliases in KNOWN_LOCATIONS.items():
+        for alias in (*aliases, canonical.lower()):
+            # Earlier locations win, as with the in-order scan this replaces
+            index.setdefault(alias, canonical)
+    return index
+
+
+_ALIAS_TO_CANONICAL = _build_alias_index()
+
+# (alias, canonical) in scan order for free-text substring detection
+_ALIAS_SCAN: Tuple[Tuple[str, str], ...] = tuple(
+    (alias, canonical) for canonical, aliases in KNOWN_LOCATIONS.items() for alias in aliases
+)
+
+_RE_WORD = re.compile(r'\b\w+\b')
+
+# Words ignored when comparing city names between two location strings
+_COMMON_LOCATION_WORDS = frozenset(
+    {'tx', 'texas', 'metro', 'area', 'downtown', 'north', 'south', 'east', 'west'}
+)
+
+
+def _extract_location(text: str) -> Optional[str]:
+    """
+    Extract location mentions from free-text request.
+
+    Args:
+        text: Customer's free-text request
+
+    Returns:
+        Extracted location phrase, or None if not found
+    """
+    if not text:
+        return None
+
+    text_lower = text.lower()
+
+    # First, check for known location keywords
+    for alias, canonical in _ALIAS_SCAN:
+        if alias in text_lower:
+            logger.debug("Found known location '%s' via alias '%s'", canonical, alias)
+            return canonical
+
+    # Try regex patterns for other locations
+    for pattern in _LOCATION_REGEXES:
+        match = pattern.search(text)
+        if match:
+            location = match.group(1).strip()
+            # Normalize common variations
+            location = _normalize_location_name(location)
+            if location:
+                logger.debug("Extracted location via pattern: '%s'", location)
+                return location
+
+    return None
+
+
+def _normalize_location_name(location: str) -> str:
+    """Normalize a location string to canonical form."""
+    if not location:
+        return location
+
+    # Check against known locations
+    canonical = _ALIAS_TO_CANONICAL.get(location.lower().strip())
+    if canonical:
+        return canonical
+
+    # Return title-cased version
+    return location.title()
+
+
+@lru_cache(maxsize=2048)
+def _locations_match(location1: str, location2: str, similarity_threshold: float) -> bool:
+    """
+    Check if two location strings refer to the same place.
+
+    Uses string similarity and known alias matching.
+    """
+    if not location1 or not location2:
+        return False
+
+    # Normalize both locations
+    loc1_lower = location1.lower().strip()
+    loc2_lower = location2.lower().strip()
+
+    # Exact match (case-insensitive)
+    if loc1_lower == loc2_lower:
+        return True
+
+    # Check if either is contained in the other
+    if loc1_lower in loc2_lower or loc2_lower in loc1_lower:
+        return True
+
+    # Check known aliases
+    loc1_canonical = _ALIAS_TO_CANONICAL.get(loc1_lower)
+    loc2_canonical = _ALIAS_TO_CANONICAL.get(loc2_lower)
+
+    if loc1_canonical and loc2_canonical:
+        if loc1_canonical == loc2_canonical:
+            return True
+
+    # Fuzzy string matching. rapidfuzz's LCS-based ratio is an upper bound on
+    # SequenceMatcher's, so pairs it rejects cannot pass the threshold.
+    if _rf_fuzz is None or _rf_fuzz.ratio(loc1_lower, loc2_lower) >= similarity_threshold * 100 - 1e-6:
+        similarity = SequenceMatcher(None, loc1_lower, loc2_lower).ratio()
+        if similarity >= similarity_threshold:
+            return True
+
+    # Check city name overlap (e.g., "Dallas metro area" vs "Dallas, TX"):
+    # any shared word that is not a common word, stopping at the first one
+    loc2_parts = set(_RE_WORD.findall(loc2_lower))
+    for word in _RE_WORD.findall(loc1_lower):
+        if word not in _COMMON_LOCATION_WORDS and word in loc2_parts:
+            return True
+
+    return False
 
 
 class LocationResolver:
@@ -80,15 +211,16 @@ class LocationResolver:
         Returns:
             ResolvedLocation with all location fields and conflict detection
         """
-        logger.debug(
-            "Resolving location",
-            extra={"extra_fields": {
-                "has_request_text": bool(request_text),
-                "selected_location_id": selected_location_id,
-                "selected_location_label": selected_location_label,
-                "postal_code": postal_code,
-            }}
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Resolving location",
+                extra={"extra_fields": {
+                    "has_request_text": bool(request_text),
+                    "selected_location_id": selected_location_id,
+                    "selected_location_label": selected_location_label,
+                    "postal_code": postal_code,
+                }}
+            )
 
         # Extract location from free text
         free_text_location = self._extract_location_from_text(request_text) if request_text else None
@@ -108,7 +240,8 @@ class LocationResolver:
             postal_code=postal_code
         )
 
-        result = ResolvedLocation(
+        # Every field is produced by this resolver, so skip pydantic validation
+        result = ResolvedLocation.model_construct(
             location_free_text=free_text_location,
             location_selected=selected_location_label,
             location_selected_id=selected_location_id,
@@ -132,54 +265,12 @@ class LocationResolver:
         return result
 
     def _extract_location_from_text(self, text: str) -> Optional[str]:
-        """
-        Extract location mentions from free-text request.
-
-        Args:
-            text: Customer's free-text request
-
-        Returns:
-            Extracted location phrase, or None if not found
-        """
-        if not text:
-            return None
-
-        text_lower = text.lower()
-
-        # First, check for known location keywords
-        for canonical, aliases in KNOWN_LOCATIONS.items():
-            for alias in aliases:
-                if alias in text_lower:
-                    logger.debug(f"Found known location '{canonical}' via alias '{alias}'")
-                    return canonical
-
-        # Try regex patterns for other locations
-        for pattern in LOCATION_PATTERNS:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                location = match.group(1).strip()
-                # Normalize common variations
-                location = self._normalize_location(location)
-                if location:
-                    logger.debug(f"Extracted location via pattern: '{location}'")
-                    return location
-
-        return None
+        """Extract location mentions from free-text request."""
+        return _extract_location(text)
 
     def _normalize_location(self, location: str) -> str:
         """Normalize a location string to canonical form."""
-        if not location:
-            return location
-
-        location_lower = location.lower().strip()
-
-        # Check against known locations
-        for canonical, aliases in KNOWN_LOCATIONS.items():
-            if location_lower in aliases or canonical.lower() == location_lower:
-                return canonical
-
-        # Return title-cased version
-        return location.title()
+        return _normalize_location_name(location)
 
     def _determine_final_location(
         self,
@@ -248,62 +339,12 @@ class LocationResolver:
         )
 
     def _locations_match(self, location1: str, location2: str) -> bool:
-        """
-        Check if two location strings refer to the same place.
-
-        Uses string similarity and known alias matching.
-        """
-        if not location1 or not location2:
-            return False
-
-        # Normalize both locations
-        loc1_lower = location1.lower().strip()
-        loc2_lower = location2.lower().strip()
-
-        # Exact match (case-insensitive)
-        if loc1_lower == loc2_lower:
-            return True
-
-        # Check if either is contained in the other
-        if loc1_lower in loc2_lower or loc2_lower in loc1_lower:
-            return True
-
-        # Check known aliases
-        loc1_canonical = self._get_canonical_location(loc1_lower)
-        loc2_canonical = self._get_canonical_location(loc2_lower)
-
-        if loc1_canonical and loc2_canonical:
-            if loc1_canonical == loc2_canonical:
-                return True
-
-        # Fuzzy string matching
-        similarity = SequenceMatcher(None, loc1_lower, loc2_lower).ratio()
-        if similarity >= self.similarity_threshold:
-            return True
-
-        # Check city name overlap (e.g., "Dallas metro area" vs "Dallas, TX")
-        loc1_parts = set(re.findall(r'\b\w+\b', loc1_lower))
-        loc2_parts = set(re.findall(r'\b\w+\b', loc2_lower))
-
-        # Remove common words
-        common_words = {'tx', 'texas', 'metro', 'area', 'downtown', 'north', 'south', 'east', 'west'}
-        loc1_meaningful = loc1_parts - common_words
-        loc2_meaningful = loc2_parts - common_words
-
-        # If meaningful words overlap significantly
-        if loc1_meaningful and loc2_meaningful:
-            overlap = loc1_meaningful & loc2_meaningful
-            if overlap:
-                return True
-
-        return False
+        """Check if two location strings refer to the same place (memoized)."""
+        return _locations_match(location1, location2, self.similarity_threshold)
 
     def _get_canonical_location(self, location_lower: str) -> Optional[str]:
         """Get canonical location name from a lowercase location string."""
-        for canonical, aliases in KNOWN_LOCATIONS.items():
-            if location_lower in aliases or canonical.lower() == location_lower:
-                return canonical
-        return None
+        return _ALIAS_TO_CANONICAL.get(location_lower)
 
 
 # Module-level resolver instance for convenience
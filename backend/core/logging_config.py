@@ -7,10 +7,17 @@ Provides JSON-formatted logs with request IDs, timestamps, and context.
 import logging
 import sys
 import json
-from datetime import datetime
-from typing import Any, Dict
+import time
+from typing import Any, Dict, Tuple
 from pathlib import Path
 
+import orjson
+
+_ORJSON_OPTS = orjson.OPT_NON_STR_KEYS
+
+# get_logger() results by name; skips logging's module lock on repeat lookups
+_LOGGERS: Dict[str, logging.Logger] = {}
+
 
 class JSONFormatter(logging.Formatter):
     """
@@ -18,9 +25,24 @@ class JSONFormatter(logging.Formatter):
     Outputs log records as JSON objects for easy parsing and analysis.
     """
 
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # (whole second, "YYYY-MM-DDTHH:MM:SS") of the last record, swapped as
+        # one tuple so handlers on other threads never see a torn pair
+        self._last_second: Tuple[int, str] = (-1, "")
+
+    def _timestamp(self, created: float) -> str:
+        """UTC ISO-8601 timestamp for record.created, reformatting once per second."""
+        sec = int(created)
+        last_sec, prefix = self._last_second
+        if sec != last_sec:
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+            self._last_second = (sec, prefix)
+        return f"{prefix}.{int((created - sec) * 1_000_000):06d}Z"
+
     def format(self, record: logging.LogRecord) -> str:
         log_data: Dict[str, Any] = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -41,7 +63,11 @@ class JSONFormatter(logging.Formatter):
         if hasattr(record, "request_id"):
             log_data["request_id"] = record.request_id
 
-        return json.dumps(log_data, default=str)
+        try:
+            return orjson.dumps(log_data, default=str, option=_ORJSON_OPTS).decode()
+        except TypeError:
+            # stdlib json still copes with ints wider than 64 bits, which orjson rejects
+            return json.dumps(log_data, default=str)
 
 
 def setup_logging(
@@ -106,7 +132,12 @@ def get_logger(name: str) -> logging.Logger:
     Returns:
         Configured logger instance
     """
-    return logging.getLogger(name)
+    logger = _LOGGERS.get(name)
+    if logger is None:
+        # logging.getLogger returns the same object for a name, so a racing
+        # setdefault can only ever store that one instance
+        logger = _LOGGERS.setdefault(name, logging.getLogger(name))
+    return logger
 
 
 class LogContext:
@@ -4,6 +4,7 @@ Middleware for RentalAI Copilot.
 Provides request/response logging, request ID tracking, and error handling.
 """
 
+import logging
 import time
 import uuid
 from typing import Callable
@@ -32,55 +33,64 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
 
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         # Generate unique request ID
-        request_id = str(uuid.uuid4())
+        request_id = uuid.uuid4().hex
         request.state.request_id = request_id
 
         # Extract request details
         method = request.method
         path = request.url.path
-        query_params = str(request.query_params) if request.query_params else None
-        client_ip = request.client.host if request.client else "unknown"
 
         # Start timing
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
 
-        # Log incoming request
-        logger.info(
-            f"Incoming request: {method} {path}",
-            extra={
-                "extra_fields": {
-                    "request_id": request_id,
-                    "method": method,
-                    "path": path,
-                    "query_params": query_params,
-                    "client_ip": client_ip,
-                    "event": "request_start",
-                }
-            },
-        )
-
-        # Process request
-        try:
-            response = await call_next(request)
-
-            # Calculate duration
-            duration_ms = int((time.time() - start_time) * 1000)
+        # Request/response records are INFO; skip building them when filtered out
+        info_on = logger.isEnabledFor(logging.INFO)
 
-            # Log successful response
+        # Log incoming request
+        if info_on:
+            query_params = str(request.query_params) if request.query_params else None
+            client_ip = request.client.host if request.client else "unknown"
             logger.info(
-                f"Request completed: {method} {path} - {response.status_code} ({duration_ms}ms)",
+                "Incoming request: %s %s",
+                method,
+                path,
                 extra={
                     "extra_fields": {
                         "request_id": request_id,
                         "method": method,
                         "path": path,
-                        "status_code": response.status_code,
-                        "duration_ms": duration_ms,
-                        "event": "request_complete",
+                        "query_params": query_params,
+                        "client_ip": client_ip,
+                        "event": "request_start",
                     }
                 },
             )
 
+        # Process request
+        try:
+            response = await call_next(request)
+
+            # Log successful response
+            if info_on:
+                duration_ms = (time.perf_counter_ns() - start_time) // 1_000_000
+                logger.info(
+                    "Request completed: %s %s - %s (%sms)",
+                    method,
+                    path,
+                    response.status_code,
+                    duration_ms,
+                    extra={
+                        "extra_fields": {
+                            "request_id": request_id,
+                            "method": method,
+                            "path": path,
+                            "status_code": response.status_code,
+                            "duration_ms": duration_ms,
+                            "event": "request_complete",
+                        }
+                    },
+                )
+
             # Add request ID to response headers for tracing
             response.headers["X-Request-ID"] = request_id
 
@@ -88,11 +98,15 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
 
         except Exception as exc:
             # Calculate duration
-            duration_ms = int((time.time() - start_time) * 1000)
+            duration_ms = (time.perf_counter_ns() - start_time) // 1_000_000
 
             # Log error
             logger.error(
-                f"Request failed: {method} {path} - {type(exc).__name__}: {str(exc)}",
+                "Request failed: %s %s - %s: %s",
+                method,
+                path,
+                type(exc).__name__,
+                exc,
                 exc_info=True,
                 extra={
                     "extra_fields": {
@@ -3,13 +3,14 @@
 PDF Quote Generator using ReportLab.
 Generates a modern, clean 1-page SaaS-style PDF quote.
 """
+import logging
 from io import BytesIO
 from typing import Any, Dict, List
 from datetime import datetime
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle, StyleSheet1
 from reportlab.lib.units import inch
 from reportlab.platypus import (
     SimpleDocTemplate,
@@ -24,56 +25,26 @@ from backend.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Modern SaaS color palette
+_PRIMARY = colors.HexColor('#2563eb')       # Blue
+_PRIMARY_DARK = colors.HexColor('#1e40af')
+_SUCCESS = colors.HexColor('#10b981')       # Green
+_TEXT_DARK = colors.HexColor('#1f2937')
+_TEXT_MED = colors.HexColor('#4b5563')
+_TEXT_LIGHT = colors.HexColor('#9ca3af')
+_BG_LIGHT = colors.HexColor('#f9fafb')
+_BORDER = colors.HexColor('#e5e7eb')
 
-def generate_quote_pdf(
-    run_id: int,
-    quote: Dict[str, Any],
-    customer_tier: str = "C",
-    location: str = "",
-    start_date: str = "",
-    end_date: str = "",
-) -> bytes:
-    """
-    Generate a modern 1-page SaaS-style PDF quote.
-
-    Args:
-        run_id: The quote run ID
-        quote: Quote data dict with items, fees, totals, notes
-        customer_tier: Customer tier (A/B/C)
-        location: Customer location/ZIP
-        start_date: Rental start date
-        end_date: Rental end date
-
-    Returns:
-        PDF file as bytes
-    """
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(
-        buffer,
-        pagesize=letter,
-        rightMargin=0.5 * inch,
-        leftMargin=0.5 * inch,
-        topMargin=0.4 * inch,
-        bottomMargin=0.4 * inch,
-    )
 
+def _build_styles() -> StyleSheet1:
+    """Sample stylesheet plus the quote's custom paragraph styles."""
     styles = getSampleStyleSheet()
 
-    # Modern SaaS color palette
-    PRIMARY = '#2563eb'      # Blue
-    PRIMARY_DARK = '#1e40af'
-    SUCCESS = '#10b981'      # Green
-    TEXT_DARK = '#1f2937'
-    TEXT_MED = '#4b5563'
-    TEXT_LIGHT = '#9ca3af'
-    BG_LIGHT = '#f9fafb'
-    BORDER = '#e5e7eb'
-
     # Custom styles - compact for 1 page
     styles.add(ParagraphStyle(
         name='Brand',
         fontSize=20,
-        textColor=colors.HexColor(PRIMARY),
+        textColor=_PRIMARY,
         fontName='Helvetica-Bold',
         spaceAfter=2,
     ))
@@ -81,14 +52,14 @@ def generate_quote_pdf(
     styles.add(ParagraphStyle(
         name='Tagline',
         fontSize=9,
-        textColor=colors.HexColor(TEXT_LIGHT),
+        textColor=_TEXT_LIGHT,
         spaceAfter=8,
     ))
 
     styles.add(ParagraphStyle(
         name='SectionTitle',
         fontSize=9,
-        textColor=colors.HexColor(TEXT_LIGHT),
+        textColor=_TEXT_LIGHT,
         fontName='Helvetica-Bold',
         spaceBefore=10,
         spaceAfter=4,
@@ -98,20 +69,20 @@ def generate_quote_pdf(
     styles.add(ParagraphStyle(
         name='InfoLabel',
         fontSize=8,
-        textColor=colors.HexColor(TEXT_LIGHT),
+        textColor=_TEXT_LIGHT,
     ))
 
     styles.add(ParagraphStyle(
         name='InfoValue',
         fontSize=9,
-        textColor=colors.HexColor(TEXT_DARK),
+        textColor=_TEXT_DARK,
         fontName='Helvetica-Bold',
     ))
 
     styles.add(ParagraphStyle(
         name='Note',
         fontSize=8,
-        textColor=colors.HexColor(TEXT_MED),
+        textColor=_TEXT_MED,
         leftIndent=8,
         spaceBefore=2,
         spaceAfter=2,
@@ -120,7 +91,7 @@ def generate_quote_pdf(
     styles.add(ParagraphStyle(
         name='Terms',
         fontSize=7,
-        textColor=colors.HexColor(TEXT_LIGHT),
+        textColor=_TEXT_LIGHT,
         spaceBefore=1,
         spaceAfter=1,
     ))
@@ -128,7 +99,7 @@ def generate_quote_pdf(
     styles.add(ParagraphStyle(
         name='TermsItem',
         fontSize=7,
-        textColor=colors.HexColor(TEXT_MED),
+        textColor=_TEXT_MED,
         spaceBefore=2,
         spaceAfter=2,
         leftIndent=12,
@@ -137,20 +108,117 @@ def generate_quote_pdf(
     styles.add(ParagraphStyle(
         name='TermsNumber',
         fontSize=7,
-        textColor=colors.HexColor(PRIMARY),
+        textColor=_PRIMARY,
         fontName='Helvetica-Bold',
     ))
 
     styles.add(ParagraphStyle(
         name='Footer',
         fontSize=7,
-        textColor=colors.HexColor(TEXT_LIGHT),
+        textColor=_TEXT_LIGHT,
         alignment=TA_CENTER,
     ))
 
+    return styles
+
+
+# Styles are read-only during a build, so every PDF shares one set
+_STYLES = _build_styles()
+
+_QUOTE_TITLE_STYLE = ParagraphStyle(
+    'QuoteTitle',
+    fontSize=24,
+    textColor=_TEXT_DARK,
+    fontName='Helvetica-Bold',
+    alignment=TA_RIGHT,
+)
+_QUOTE_NUM_STYLE = ParagraphStyle(
+    'QuoteNum',
+    fontSize=10,
+    textColor=_TEXT_LIGHT,
+    alignment=TA_RIGHT,
+)
+_TERM_NUM_STYLE = ParagraphStyle(
+    'TermNum',
+    fontSize=7,
+    textColor=_PRIMARY,
+    fontName='Helvetica-Bold',
+)
+_TERM_TEXT_STYLE = ParagraphStyle(
+    'TermText',
+    fontSize=7,
+    textColor=_TEXT_MED,
+)
+
+
+# Professional terms list. The text never changes, so the row markup and
+# table style are prepared once; the Paragraph/Table flowables are still
+# built per PDF because platypus keeps layout state on them during a build
+# and quotes can be rendered concurrently from the threadpool.
+_TERMS_LIST = (
+    ("Quote Validity", "This quote is valid for 30 days from the date of issuance."),
+    ("Reservation & Deposit", "25% non-refundable deposit required. Balance due upon delivery."),
+    ("Cancellation Policy", "7+ days: full deposit refund. Within 7 days: deposit forfeited."),
+    ("Delivery & Pickup", "Times are estimates. Clear access required. Additional charges may apply."),
+    ("Equipment Condition", "Customer responsible from delivery to pickup. Damage charged at replacement cost."),
+    ("Damage Waiver", "Covers accidental damage up to $1,000/item. Excludes intentional damage/theft."),
+    ("Setup & Breakdown", "Basic delivery is drop-off only. Setup services available at additional cost."),
+    ("Weather Policy", "Customer assumes responsibility for weather-related decisions."),
+    ("Extension Policy", "24-hour advance notice required. Late returns: 1.5x daily rate."),
+    ("Liability", "Customer agrees to indemnify rental company from claims arising from use."),
+)
+_TERMS_ROWS = tuple(
+    (f"{i}.", f"<b>{title}:</b> {desc}") for i, (title, desc) in enumerate(_TERMS_LIST, 1)
+)
+_TERMS_TABLE_STYLE = TableStyle([
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('TOPPADDING', (0, 0), (-1, -1), 2),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+    ('LEFTPADDING', (0, 0), (-1, -1), 0),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 4),
+])
+_TERMS_FOOTER = "By proceeding with this quote, customer acknowledges and agrees to the above terms."
+
+
+def generate_quote_pdf(
+    run_id: int,
+    quote: Dict[str, Any],
+    customer_tier: str = "C",
+    location: str = "",
+    start_date: str = "",
+    end_date: str = "",
+) -> bytes:
+    """
+    Generate a modern 1-page SaaS-style PDF quote.
+
+    Args:
+        run_id: The quote run ID
+        quote: Quote data dict with items, fees, totals, notes
+        customer_tier: Customer tier (A/B/C)
+        location: Customer location/ZIP
+        start_date: Rental start date
+        end_date: Rental end date
+
+    Returns:
+        PDF file as bytes
+    """
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=letter,
+        rightMargin=0.5 * inch,
+        leftMargin=0.5 * inch,
+        topMargin=0.4 * inch,
+        bottomMargin=0.4 * inch,
+    )
+
+    styles = _STYLES
+
     # Build content
     story = []
     currency = quote.get("currency", "$")
+    # "<currency>1,234.56" for every amount; braces escaped so any symbol is literal
+    money = (str(currency).replace("{", "{{").replace("}", "}}") + "{:,.2f}").format
     generated_date = datetime.now().strftime("%b %d, %Y")
     generated_time = datetime.now().strftime("%I:%M %p")
 
@@ -179,19 +247,8 @@ def generate_quote_pdf(
     ]
 
     header_right = [
-        [Paragraph("QUOTE", ParagraphStyle(
-            'QuoteTitle',
-            fontSize=24,
-            textColor=colors.HexColor(TEXT_DARK),
-            fontName='Helvetica-Bold',
-            alignment=TA_RIGHT,
-        ))],
-        [Paragraph(f"#{run_id}", ParagraphStyle(
-            'QuoteNum',
-            fontSize=10,
-            textColor=colors.HexColor(TEXT_LIGHT),
-            alignment=TA_RIGHT,
-        ))],
+        [Paragraph("QUOTE", _QUOTE_TITLE_STYLE)],
+        [Paragraph(f"#{run_id}", _QUOTE_NUM_STYLE)],
     ]
 
     header_table = Table(
@@ -226,13 +283,13 @@ def generate_quote_pdf(
 
     info_table = Table(info_data, colWidths=[1.875 * inch] * 4)
     info_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor(BG_LIGHT)),
+        ('BACKGROUND', (0, 0), (-1, -1), _BG_LIGHT),
         ('TOPPADDING', (0, 0), (-1, -1), 6),
         ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
         ('LEFTPADDING', (0, 0), (-1, -1), 8),
         ('RIGHTPADDING', (0, 0), (-1, -1), 8),
         ('ROUNDEDCORNERS', [4, 4, 4, 4]),
-        ('BOX', (0, 0), (-1, -1), 0.5, colors.HexColor(BORDER)),
+        ('BOX', (0, 0), (-1, -1), 0.5, _BORDER),
     ]))
     story.append(info_table)
     story.append(Spacer(1, 12))
@@ -256,14 +313,14 @@ def generate_quote_pdf(
             name,
             str(qty),
             str(item_days),
-            f"{currency}{daily_rate:,.2f}",
-            f"{currency}{subtotal:,.2f}",
+            money(daily_rate),
+            money(subtotal),
         ])
 
     items_table = Table(table_data, colWidths=[3.0 * inch, 0.6 * inch, 0.6 * inch, 1.2 * inch, 1.2 * inch])
     items_table.setStyle(TableStyle([
         # Header
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(PRIMARY)),
+        ('BACKGROUND', (0, 0), (-1, 0), _PRIMARY),
         ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
         ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
         ('FONTSIZE', (0, 0), (-1, 0), 8),
@@ -273,17 +330,17 @@ def generate_quote_pdf(
         # Body
         ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
         ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('TEXTCOLOR', (0, 1), (-1, -1), colors.HexColor(TEXT_DARK)),
+        ('TEXTCOLOR', (0, 1), (-1, -1), _TEXT_DARK),
         ('ALIGN', (1, 1), (2, -1), 'CENTER'),
         ('ALIGN', (3, 1), (-1, -1), 'RIGHT'),
 
         # Alternating rows
-        *[('BACKGROUND', (0, i), (-1, i), colors.HexColor(BG_LIGHT))
+        *[('BACKGROUND', (0, i), (-1, i), _BG_LIGHT)
           for i in range(2, len(table_data), 2)],
 
         # Borders
-        ('BOX', (0, 0), (-1, -1), 0.5, colors.HexColor(BORDER)),
-        ('LINEBELOW', (0, 0), (-1, 0), 1, colors.HexColor(PRIMARY_DARK)),
+        ('BOX', (0, 0), (-1, -1), 0.5, _BORDER),
+        ('LINEBELOW', (0, 0), (-1, 0), 1, _PRIMARY_DARK),
 
         # Padding
         ('TOPPADDING', (0, 0), (-1, -1), 6),
@@ -300,32 +357,32 @@ def generate_quote_pdf(
     fees = quote.get("fees", [])
     total = quote.get("total", 0)
 
-    summary_rows = [["", "Subtotal:", f"{currency}{subtotal:,.2f}"]]
+    summary_rows = [["", "Subtotal:", money(subtotal)]]
 
     for fee in fees:
         fee_name = fee.get("name", fee.get("rule", "Fee")).replace("_", " ")
         fee_amount = fee.get("amount", 0)
-        summary_rows.append(["", f"{fee_name}:", f"{currency}{fee_amount:,.2f}"])
+        summary_rows.append(["", f"{fee_name}:", money(fee_amount)])
 
-    summary_rows.append(["", "Tax:", f"{currency}{tax:,.2f}"])
+    summary_rows.append(["", "Tax:", money(tax)])
     summary_rows.append(["", "", ""])  # Spacer
-    summary_rows.append(["", "TOTAL:", f"{currency}{total:,.2f}"])
+    summary_rows.append(["", "TOTAL:", money(total)])
 
     summary_table = Table(summary_rows, colWidths=[4.5 * inch, 1.5 * inch, 1.5 * inch])
     summary_table.setStyle(TableStyle([
         ('FONTNAME', (0, 0), (-1, -2), 'Helvetica'),
         ('FONTSIZE', (0, 0), (-1, -2), 9),
-        ('TEXTCOLOR', (1, 0), (1, -2), colors.HexColor(TEXT_MED)),
-        ('TEXTCOLOR', (2, 0), (2, -2), colors.HexColor(TEXT_DARK)),
+        ('TEXTCOLOR', (1, 0), (1, -2), _TEXT_MED),
+        ('TEXTCOLOR', (2, 0), (2, -2), _TEXT_DARK),
         ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
         ('ALIGN', (2, 0), (2, -1), 'RIGHT'),
 
         # Total row
         ('FONTNAME', (1, -1), (-1, -1), 'Helvetica-Bold'),
         ('FONTSIZE', (1, -1), (-1, -1), 12),
-        ('TEXTCOLOR', (1, -1), (1, -1), colors.HexColor(TEXT_DARK)),
-        ('TEXTCOLOR', (2, -1), (2, -1), colors.HexColor(SUCCESS)),
-        ('LINEABOVE', (1, -1), (-1, -1), 1, colors.HexColor(PRIMARY)),
+        ('TEXTCOLOR', (1, -1), (1, -1), _TEXT_DARK),
+        ('TEXTCOLOR', (2, -1), (2, -1), _SUCCESS),
+        ('LINEABOVE', (1, -1), (-1, -1), 1, _PRIMARY),
 
         ('TOPPADDING', (0, 0), (-1, -1), 3),
         ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
@@ -349,55 +406,19 @@ def generate_quote_pdf(
     # ============ TERMS & CONDITIONS ============
     story.append(Paragraph("TERMS & CONDITIONS", styles['SectionTitle']))
 
-    # Professional terms list
-    terms_list = [
-        ("Quote Validity", "This quote is valid for 30 days from the date of issuance."),
-        ("Reservation & Deposit", "25% non-refundable deposit required. Balance due upon delivery."),
-        ("Cancellation Policy", "7+ days: full deposit refund. Within 7 days: deposit forfeited."),
-        ("Delivery & Pickup", "Times are estimates. Clear access required. Additional charges may apply."),
-        ("Equipment Condition", "Customer responsible from delivery to pickup. Damage charged at replacement cost."),
-        ("Damage Waiver", "Covers accidental damage up to $1,000/item. Excludes intentional damage/theft."),
-        ("Setup & Breakdown", "Basic delivery is drop-off only. Setup services available at additional cost."),
-        ("Weather Policy", "Customer assumes responsibility for weather-related decisions."),
-        ("Extension Policy", "24-hour advance notice required. Late returns: 1.5x daily rate."),
-        ("Liability", "Customer agrees to indemnify rental company from claims arising from use."),
-    ]
-
     # Create terms table for better formatting
-    terms_data = []
-    term_num_style = ParagraphStyle(
-        'TermNum',
-        fontSize=7,
-        textColor=colors.HexColor(PRIMARY),
-        fontName='Helvetica-Bold',
-    )
-    term_text_style = ParagraphStyle(
-        'TermText',
-        fontSize=7,
-        textColor=colors.HexColor(TEXT_MED),
-    )
-
-    for i, (title, desc) in enumerate(terms_list, 1):
-        terms_data.append([
-            Paragraph(f"{i}.", term_num_style),
-            Paragraph(f"<b>{title}:</b> {desc}", term_text_style)
-        ])
-
+    terms_data = [
+        [Paragraph(number, _TERM_NUM_STYLE), Paragraph(text, _TERM_TEXT_STYLE)]
+        for number, text in _TERMS_ROWS
+    ]
     terms_table = Table(terms_data, colWidths=[0.25 * inch, 7.0 * inch])
-    terms_table.setStyle(TableStyle([
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('TOPPADDING', (0, 0), (-1, -1), 2),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
-        ('LEFTPADDING', (0, 0), (-1, -1), 0),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 4),
-    ]))
+    terms_table.setStyle(_TERMS_TABLE_STYLE)
 
     story.append(terms_table)
     story.append(Spacer(1, 6))
 
     # Terms footer
-    terms_footer = "By proceeding with this quote, customer acknowledges and agrees to the above terms."
-    story.append(Paragraph(terms_footer, styles['Terms']))
+    story.append(Paragraph(_TERMS_FOOTER, styles['Terms']))
     story.append(Spacer(1, 8))
 
     # ============ FOOTER ============
@@ -410,9 +431,11 @@ def generate_quote_pdf(
     pdf_bytes = buffer.getvalue()
     buffer.close()
 
-    logger.info(
-        f"Generated PDF quote for run {run_id}",
-        extra={"extra_fields": {"run_id": run_id, "pdf_size_bytes": len(pdf_bytes)}},
-    )
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "Generated PDF quote for run %s",
+            run_id,
+            extra={"extra_fields": {"run_id": run_id, "pdf_size_bytes": len(pdf_bytes)}},
+        )
 
     return pdf_bytes
@@ -2,8 +2,9 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional
 
+import orjson
 from sqlalchemy import text
 from sqlalchemy.engine import Result
 
@@ -13,6 +14,11 @@ from backend.db.connect import SessionLocal
 def _dumps(obj: Any) -> str:
     """Safe JSON serialization (falls back to repr if needed)."""
     try:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    except TypeError:
+        pass
+    try:
+        # stdlib json still copes with ints wider than 64 bits, which orjson rejects
         return json.dumps(obj, ensure_ascii=False)
     except Exception:
         # last resort to avoid crashing tracing
@@ -45,6 +51,19 @@ def _fetch_last_inserted_id(result: Result) -> Optional[int]:
     return None
 
 
+_INSERT_RUN_RETURNING_SQL = text(
+    "INSERT INTO runs (input_text, seed, status, cost_usd) "
+    "VALUES (:t, :seed, 'running', 0) RETURNING id"
+)
+_INSERT_RUN_SQL = text(
+    "INSERT INTO runs (input_text, seed, status, cost_usd) "
+    "VALUES (:t, :seed, 'running', 0)"
+)
+_FINISH_RUN_SQL = text(
+    "UPDATE runs SET status='finished', cost_usd=:c WHERE id=:rid"
+)
+
+
 def start_run(input_text: str, seed: Optional[int]) -> int:
     """
     Create a run row with status='running'. Returns the new run id.
@@ -54,10 +73,7 @@ def start_run(input_text: str, seed: Optional[int]) -> int:
         # Try RETURNING first
         try:
             result = s.execute(
-                text(
-                    "INSERT INTO runs (input_text, seed, status, cost_usd) "
-                    "VALUES (:t, :seed, 'running', 0) RETURNING id"
-                ),
+                _INSERT_RUN_RETURNING_SQL,
                 {"t": input_text, "seed": seed if seed is not None else 0},
             )
             s.commit()
@@ -68,10 +84,7 @@ def start_run(input_text: str, seed: Optional[int]) -> int:
             s.rollback()
             # Fallback path without RETURNING
             result = s.execute(
-                text(
-                    "INSERT INTO runs (input_text, seed, status, cost_usd) "
-                    "VALUES (:t, :seed, 'running', 0)"
-                ),
+                _INSERT_RUN_SQL,
                 {"t": input_text, "seed": seed if seed is not None else 0},
             )
             s.commit()
@@ -82,6 +95,27 @@ def start_run(input_text: str, seed: Optional[int]) -> int:
     raise RuntimeError("Failed to create run id")
 
 
+_INSERT_STEP_SQL = text(
+    "INSERT INTO steps (run_id, kind, input_json, output_json, latency_ms) "
+    "VALUES (:rid, :k, :in_json, :out_json, :lat)"
+)
+
+
+def step_row(
+    kind: str, input_json: Any, output_json: Any, latency_ms: int
+) -> Dict[str, Any]:
+    """
+    Serialize a step for add_step_batch. JSON is rendered immediately so later
+    mutation of the payload objects does not leak into the recorded trace.
+    """
+    return {
+        "k": kind,
+        "in_json": _dumps(input_json),
+        "out_json": _dumps(output_json),
+        "lat": int(latency_ms or 0),
+    }
+
+
 def add_step(
     run_id: int, kind: str, input_json: Any, output_json: Any, latency_ms: int
 ) -> None:
@@ -89,30 +123,33 @@ def add_step(
     Append a step to the steps table. Stores valid JSON in input_json/output_json.
     Table expected: steps(id PK, run_id INT, kind TEXT, input_json JSON, output_json JSON, latency_ms INT, created_at ...).
     """
+    add_step_batch(run_id, [step_row(kind, input_json, output_json, latency_ms)])
+
+
+def add_step_batch(run_id: int, steps: List[Dict[str, Any]]) -> None:
+    """
+    Insert several steps (built with step_row) in one executemany and commit.
+    Rows keep their list order, so step ids stay in pipeline order.
+    """
+    if not steps:
+        return
     with SessionLocal() as s:
-        s.execute(
-            text(
-                "INSERT INTO steps (run_id, kind, input_json, output_json, latency_ms) "
-                "VALUES (:rid, :k, :in_json, :out_json, :lat)"
-            ),
-            {
-                "rid": run_id,
-                "k": kind,
-                "in_json": _dumps(input_json),
-                "out_json": _dumps(output_json),
-                "lat": int(latency_ms or 0),
-            },
-        )
+        s.execute(_INSERT_STEP_SQL, [{"rid": run_id, **row} for row in steps])
         s.commit()
 
 
-def finish_run(run_id: int, cost: float = 0.0) -> None:
+def finish_run(
+    run_id: int, cost: float = 0.0, steps: Optional[List[Dict[str, Any]]] = None
+) -> None:
     """
-    Mark run finished and record total cost.
+    Mark run finished and record total cost. Any final steps (built with
+    step_row) are inserted in the same transaction.
     """
     with SessionLocal() as s:
+        if steps:
+            s.execute(_INSERT_STEP_SQL, [{"rid": run_id, **row} for row in steps])
         s.execute(
-            text("UPDATE runs SET status='finished', cost_usd=:c WHERE id=:rid"),
+            _FINISH_RUN_SQL,
             {"c": float(cost or 0.0), "rid": run_id},
         )
         s.commit()
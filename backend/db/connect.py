@@ -17,9 +17,13 @@ if not DATABASE_URL:
     DB_NAME = os.getenv("DB_NAME", "por")
     DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
+# Pool sizing is tunable so a busy API container can hold more connections
 engine = create_engine(
     DATABASE_URL,
     pool_pre_ping=True,
+    pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
+    pool_recycle=int(os.getenv("DB_POOL_RECYCLE_S", "3600")),
     future=True,
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
@@ -10,7 +10,7 @@ from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 
 from backend.models import QuoteRunPayload
-from backend.core.tracing import start_run, add_step, finish_run
+from backend.core.tracing import start_run, finish_run, step_row
 from backend.core.agent import run_quote_loop
 from backend.db.connect import SessionLocal
 from backend.core.logging_config import get_logger
@@ -179,8 +179,11 @@ def run_quote(req: QuoteRunPayload, request: Request) -> Dict[str, Any]:
             exc_info=True,
             extra={"extra_fields": {"request_id": request_id, "run_id": run_id}},
         )
-        add_step(run_id, "error", {"payload": payload}, {"error": str(e)}, 0)
-        finish_run(run_id, cost=0.0)
+        finish_run(
+            run_id,
+            cost=0.0,
+            steps=[step_row("error", {"payload": payload}, {"error": str(e)}, 0)],
+        )
         raise QuoteGenerationError(
             f"Invalid quote data: {str(e)}",
             details={"request_id": request_id, "run_id": run_id},
@@ -191,8 +194,11 @@ def run_quote(req: QuoteRunPayload, request: Request) -> Dict[str, Any]:
             exc_info=True,
             extra={"extra_fields": {"request_id": request_id, "run_id": run_id}},
         )
-        add_step(run_id, "error", {"payload": payload}, {"error": str(e)}, 0)
-        finish_run(run_id, cost=0.0)
+        finish_run(
+            run_id,
+            cost=0.0,
+            steps=[step_row("error", {"payload": payload}, {"error": str(e)}, 0)],
+        )
         raise QuoteGenerationError(
             "Failed to generate quote",
             details={"request_id": request_id, "run_id": run_id, "error": str(e)},
@@ -309,14 +315,18 @@ def feedback(inb: FeedbackIn, request: Request) -> Dict[str, Any]:
 
             # Always adapt to UI + record feedback
             ui_quote = _adapt_quote_for_ui(quote)
-            add_step(
+            finish_run(
                 inb.run_id,
-                "feedback_apply",
-                {"rating": inb.rating, "note": inb.note},
-                ui_quote,
-                0,
+                0.0,
+                steps=[
+                    step_row(
+                        "feedback_apply",
+                        {"rating": inb.rating, "note": inb.note},
+                        ui_quote,
+                        0,
+                    )
+                ],
             )
-            finish_run(inb.run_id, 0.0)
 
             logger.info(
                 f"Feedback processed successfully for run {inb.run_id}",
@@ -2,6 +2,8 @@
 Test cases for the RentalAI item parser.
 Covers quantity extraction, SKU matching, and various input formats.
 """
+from difflib import SequenceMatcher
+
 import pytest
 from backend.core.item_parser import (
     parse_items_from_message,
@@ -10,7 +12,9 @@ from backend.core.item_parser import (
     find_matching_sku,
     normalize_text,
     extract_line_items,
+    ITEM_SYNONYMS,
 )
+from backend.core import item_parser
 
 
 class TestCriticalBugFix:
@@ -87,6 +91,12 @@ class TestQuantityParsing:
         assert parse_quantity("5x") == 5
         assert parse_quantity("10x") == 10
 
+    def test_qty_format(self):
+        """Test 'qty 5' format."""
+        assert parse_quantity("qty 5") == 5
+        assert parse_quantity("QTY: 12") == 12
+        assert parse_quantity("-5") is None
+
 
 class TestSKUMatching:
     """Test SKU matching from item descriptions."""
@@ -119,6 +129,101 @@ class TestSKUMatching:
         assert sku == "SPEAKER-PA-PRO"
 
 
+def _nested_synonym_items():
+    """Item texts containing overlapping and nested synonyms."""
+    synonyms = list(ITEM_SYNONYMS)
+    items = [
+        "white folding chairs and round tables",
+        "60 inch round table with white folding chair",
+        "gold chiavari chairs",
+        "chair folding white plastic",
+        "round table chair",
+    ]
+    items += [f"deluxe {s} rental" for s in synonyms]
+    items += [f"{a} {b}" for a, b in zip(synonyms, synonyms[1:])]
+    items += [f"{b} {a}" for a, b in zip(synonyms, reversed(synonyms))]
+    return items
+
+
+class TestSynonymScanPaths:
+    """Test that the Aho-Corasick scan and the linear scan agree."""
+
+    def test_automaton_matches_linear_scan(self, monkeypatch):
+        """Test both substring paths on overlapping and nested synonyms."""
+        pytest.importorskip("ahocorasick")
+        automaton = item_parser._build_synonym_automaton()
+        match = item_parser.find_matching_sku.__wrapped__
+
+        for item in _nested_synonym_items():
+            monkeypatch.setattr(item_parser, "_SYNONYM_AUTOMATON", automaton)
+            with_automaton = match(item)
+            monkeypatch.setattr(item_parser, "_SYNONYM_AUTOMATON", None)
+            linear = match(item)
+            assert with_automaton == linear, item
+
+    def test_linear_scan_prefers_longest_synonym(self, monkeypatch):
+        """Test the fallback used when pyahocorasick is not installed."""
+        monkeypatch.setattr(item_parser, "_SYNONYM_AUTOMATON", None)
+        match = item_parser.find_matching_sku.__wrapped__
+
+        sku, conf = match("deluxe white folding chair rental")
+        assert sku == "CHAIR-FOLD-WHT"
+        assert conf == min(1.0, 0.85 + len("white folding chair") / 50)
+
+
+def _misspelled_items():
+    """Near-miss spellings of a spread of synonyms, to exercise the fuzzy pass."""
+    items = []
+    for synonym in list(ITEM_SYNONYMS)[::5]:
+        mid = len(synonym) // 2
+        items.append(synonym[:mid] + synonym[mid + 1:])           # dropped letter
+        items.append(synonym[1] + synonym[0] + synonym[2:])       # swapped letters
+        items.append("x" + synonym[1:])                           # wrong first letter
+        items.append(synonym[:mid] + "qz" + synonym[mid:])        # inserted letters
+    return items
+
+
+class TestFuzzyPrefilter:
+    """Test that the rapidfuzz prefilter never drops an acceptable synonym."""
+
+    def test_prefilter_keeps_every_accepted_synonym(self):
+        """Test the prefilter against SequenceMatcher near the cutoff."""
+        pytest.importorskip("rapidfuzz")
+        table = list(zip(item_parser._FUZZY_KEYS, item_parser._FUZZY_SKUS))
+
+        for item in _misspelled_items():
+            normalized = normalize_text(item.lower().strip())
+            ratios = [SequenceMatcher(None, normalized, key).ratio() for key, _sku in table]
+            for min_similarity in (0.4, 0.55, 0.7, 0.9):
+                candidates = set(item_parser._fuzzy_candidates(normalized, min_similarity))
+                for entry, ratio in zip(table, ratios):
+                    if ratio >= min_similarity:
+                        assert entry in candidates, (item, entry, min_similarity)
+
+    def test_prefilter_does_not_change_matches(self, monkeypatch):
+        """Test find_matching_sku with and without the prefilter."""
+        pytest.importorskip("rapidfuzz")
+        match = item_parser.find_matching_sku.__wrapped__
+        rf_process = item_parser._rf_process
+
+        for item in _misspelled_items():
+            monkeypatch.setattr(item_parser, "_rf_process", rf_process)
+            prefiltered = match(item)
+            monkeypatch.setattr(item_parser, "_rf_process", None)
+            full_scan = match(item)
+            assert prefiltered == full_scan, item
+
+    def test_without_rapidfuzz_scores_every_synonym(self, monkeypatch):
+        """Test the fallback used when rapidfuzz is not installed."""
+        monkeypatch.setattr(item_parser, "_rf_process", None)
+        candidates = list(item_parser._fuzzy_candidates("sound sytem", 0.55))
+        assert candidates == list(zip(item_parser._FUZZY_KEYS, item_parser._FUZZY_SKUS))
+
+        sku, conf = item_parser.find_matching_sku.__wrapped__("sound sytem")
+        assert sku == "SPEAKER-PA-PRO"
+        assert 0.55 <= conf < 1.0
+
+
 class TestTextNormalization:
     """Test text normalization functions."""
 
@@ -153,6 +258,12 @@ class TestLineItemExtraction:
         assert items[0]["qty"] == 50
         assert items[1]["qty"] == 10
 
+    def test_serial_comma_extraction(self):
+        """Test that ', and' does not swallow the next quantity."""
+        items = extract_line_items("50 chairs, 10 tables, and 2 tents")
+        assert [item["qty"] for item in items] == [50, 10, 2]
+        assert items[2]["normalizedName"] == "tents"
+
     def test_size_spec_extraction(self):
         """Test extracting items with size specifications."""
         items = extract_line_items("5 60 inch round tables")
@@ -168,6 +279,7 @@ class TestDurationExtraction:
         """Test explicit day counts."""
         assert extract_duration_hint("for 3 days") == 3
         assert extract_duration_hint("5 day rental") == 5
+        assert extract_duration_hint("a 2-day wedding") == 2
 
     def test_weekend(self):
         """Test weekend detection."""
@@ -179,6 +291,22 @@ class TestDurationExtraction:
         assert extract_duration_hint("for a week") == 7
         assert extract_duration_hint("for a month") == 30
 
+    def test_mixed_hint_priority(self):
+        """Test that mixed hints resolve by priority, not by position."""
+        # An explicit day count always wins
+        assert extract_duration_hint("weekend event, 3 days") == 3
+        assert extract_duration_hint("3 days over the weekend") == 3
+        assert extract_duration_hint("Friday to Sunday, 2 days") == 2
+        # Friday-Sunday / weekend beat week, which beats month
+        assert extract_duration_hint("friday thru sunday for the month") == 3
+        assert extract_duration_hint("Friday - Sunday") == 3
+        assert extract_duration_hint("one week then the weekend") == 3
+        assert extract_duration_hint("a weekend, maybe a week") == 3
+        assert extract_duration_hint("month-long install, a week minimum") == 7
+        assert extract_duration_hint("a week or a month") == 7
+        # Abbreviated day names are not a hint
+        assert extract_duration_hint("fri-sun") is None
+
 
 class TestComplexScenarios:
     """Test complex real-world scenarios."""
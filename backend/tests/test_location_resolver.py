@@ -2,7 +2,10 @@
 Test cases for the LocationResolver module.
 Covers location extraction, conflict detection, and resolution logic.
 """
+from difflib import SequenceMatcher
+
 import pytest
+from backend.core import location_resolver
 from backend.core.location_resolver import (
     LocationResolver,
     resolve_location,
@@ -367,6 +370,41 @@ class TestKnownLocations:
         assert "ft worth" in KNOWN_LOCATIONS["Fort Worth, TX"]
 
 
+class TestFuzzyLocationMatch:
+    """Test the fuzzy branch of location matching right at the threshold."""
+
+    # Misspellings that share no word, alias or substring, so only the
+    # similarity ratio decides the result
+    NEAR_MISSES = [
+        ("Dallas", "Dalas"),
+        ("Houston", "Huston"),
+        ("Austin", "Austen"),
+        ("San Antonio", "Sna Antonoi"),
+        ("Plano", "Plaino"),
+        ("Arlington", "Arlingtn"),
+        ("Denton", "Dentn Tx"),
+        ("Irving", "Irvng"),
+    ]
+
+    def _assert_threshold_edge(self):
+        match = location_resolver._locations_match.__wrapped__
+        for loc1, loc2 in self.NEAR_MISSES:
+            ratio = SequenceMatcher(None, loc1.lower(), loc2.lower()).ratio()
+            assert match(loc1, loc2, ratio), (loc1, loc2)
+            assert not match(loc1, loc2, ratio + 1e-3), (loc1, loc2)
+
+    def test_threshold_edge_with_rapidfuzz(self, monkeypatch):
+        """Test that the rapidfuzz prefilter keeps pairs exactly at the threshold."""
+        rf_fuzz = pytest.importorskip("rapidfuzz.fuzz")
+        monkeypatch.setattr(location_resolver, "_rf_fuzz", rf_fuzz)
+        self._assert_threshold_edge()
+
+    def test_threshold_edge_without_rapidfuzz(self, monkeypatch):
+        """Test the SequenceMatcher-only path used when rapidfuzz is missing."""
+        monkeypatch.setattr(location_resolver, "_rf_fuzz", None)
+        self._assert_threshold_edge()
+
+
 # Run tests directly if needed
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,193 @@
+"""
+Test cases for quote pricing in the RentalAI agent.
+Covers cent rounding, a full quote computation with mocked rates, trace
+writes when a run fails, and AI summary errors.
+"""
+import os
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+# agent refuses to import without a key; no request is made in these tests
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from backend.core import agent
+from backend.core.agent import _compute, _pct_of_cents
+
+
+class TestPctOfCents:
+    """Test percentage-of-cents rounding."""
+
+    def test_half_cent_ties_round_away_from_zero(self):
+        """Test that exact half cents round up in magnitude."""
+        assert _pct_of_cents(1250, 5) == 63      # 62.5
+        assert _pct_of_cents(8805, 10) == 881    # 880.5
+        assert _pct_of_cents(5, 10) == 1         # 0.5
+        assert _pct_of_cents(1000, 8.25) == 83   # 82.5
+
+    def test_non_ties_round_to_nearest(self):
+        """Test that other fractions round to the nearest cent."""
+        assert _pct_of_cents(49, 1) == 0         # 0.49
+        assert _pct_of_cents(51, 1) == 1         # 0.51
+        assert _pct_of_cents(9414, 10) == 941    # 941.4
+        assert _pct_of_cents(8806, 8.25) == 726  # 726.495
+
+    def test_negative_amounts_and_pcts(self):
+        """Test that negative inputs mirror the positive results."""
+        assert _pct_of_cents(-1250, 5) == -63
+        assert _pct_of_cents(1250, -5) == -63
+        assert _pct_of_cents(-1250, -5) == 63
+        assert _pct_of_cents(-1000, 8.25) == -83
+
+    def test_zero_pct(self):
+        """Test that a zero percentage yields zero."""
+        assert _pct_of_cents(1250, 0) == 0
+        assert _pct_of_cents(1250, 0.0) == 0
+        assert _pct_of_cents(0, 5) == 0
+
+
+class TestCompute:
+    """Test full quote computation with mocked rate lookups."""
+
+    RATES = {
+        "CHAIR-FOLD-WHT": {"sku": "CHAIR-FOLD-WHT", "daily": 2.50, "delivery_fee_base": 75.00, "name": "White Folding Chair"},
+        "TABLE-60RND": {"sku": "TABLE-60RND", "daily": 12.35, "delivery_fee_base": 95.50, "name": "60in Round Table"},
+    }
+    POLICIES = {
+        "tier_discounts": {"A": {"pct": 15.0}, "B": {"pct": 5.0}, "C": {"pct": 0.0}},
+        "default_damage_waiver": {"pct": 10.0},
+        "tax_rate": {"pct": 10.0},
+    }
+
+    @pytest.fixture(autouse=True)
+    def mock_rates(self, monkeypatch):
+        monkeypatch.setattr(
+            agent,
+            "_fetch_rates_for_skus",
+            lambda skus, conn=None: {s: self.RATES[s] for s in skus if s in self.RATES},
+        )
+
+    def test_quote_totals(self):
+        """Test a tier B quote whose discount and tax land on half-cent ties."""
+        items = [
+            {"sku": "CHAIR-FOLD-WHT", "quantity": 5},
+            {"sku": "TABLE-60RND", "quantity": 3},
+        ]
+        quote = _compute(items, 2, self.POLICIES, tier="B")
+
+        assert [(i["sku"], i["qty"], i["unitPrice"], i["subtotal"]) for i in quote["items"]] == [
+            ("CHAIR-FOLD-WHT", 5, 5.0, 25.0),
+            ("TABLE-60RND", 3, 24.7, 74.1),
+        ]
+        assert quote["subtotal_before_discount"] == 99.10
+        assert quote["discount_pct"] == 5.0
+        assert quote["discount_amount"] == 4.96   # 4.955 rounds up
+        assert quote["subtotal"] == 94.14
+        assert quote["fees"] == [
+            {"name": "Damage Waiver", "amount": 9.41},
+            {"name": "Delivery & Pickup", "amount": 95.5},
+        ]
+        assert quote["tax"] == 19.91              # 19.905 rounds up
+        assert quote["total"] == 218.96
+        assert quote["days"] == 2
+
+    def test_missing_rate_raises(self):
+        """Test that an unknown SKU is rejected."""
+        with pytest.raises(ValueError):
+            _compute([{"sku": "NOPE", "quantity": 1}], 1, self.POLICIES)
+
+
+class TestRatesCache:
+    """Test the per-SKU rate cache and its invalidation."""
+
+    @pytest.fixture(autouse=True)
+    def loads(self, monkeypatch):
+        loaded = []
+
+        def fake_load(skus, conn=None):
+            loaded.append(sorted(skus))
+            return {s: TestCompute.RATES[s] for s in skus if s in TestCompute.RATES}
+
+        monkeypatch.setattr(agent, "_load_rates_for_skus", fake_load)
+        agent.invalidate_rates()
+        yield loaded
+        agent.invalidate_rates()
+
+    def test_single_sku_eviction(self, loads):
+        """Test that invalidating one SKU reloads only that SKU."""
+        skus = ["CHAIR-FOLD-WHT", "TABLE-60RND"]
+        agent._fetch_rates_for_skus(skus)
+        agent._fetch_rates_for_skus(skus)
+        assert loads == [skus]
+
+        agent.invalidate_rates("TABLE-60RND")
+        rates = agent._fetch_rates_for_skus(skus)
+        assert loads == [skus, ["TABLE-60RND"]]
+        assert set(rates) == set(skus)
+
+        # Unknown SKUs are ignored
+        agent.invalidate_rates("NOPE")
+        agent._fetch_rates_for_skus(skus)
+        assert len(loads) == 2
+
+    def test_full_invalidation(self, loads):
+        """Test that invalidating without a SKU reloads everything."""
+        skus = ["CHAIR-FOLD-WHT", "TABLE-60RND"]
+        agent._fetch_rates_for_skus(skus)
+        agent.invalidate_rates()
+        agent._fetch_rates_for_skus(skus)
+        assert loads == [skus, skus]
+
+
+class TestTraceFlush:
+    """Test that trace write failures never mask the quote's own error."""
+
+    def test_failed_flush_keeps_quote_error(self, monkeypatch):
+        """Test that a validation error survives a failing trace write."""
+        calls = []
+
+        def fake_steps(run_id, payload, steps):
+            steps.append({"name": "parse"})
+            raise ValueError("no items")
+
+        def failing_batch(run_id, steps):
+            calls.append(list(steps))
+            raise OperationalError("INSERT", {}, Exception("db down"))
+
+        monkeypatch.setattr(agent, "_run_quote_steps", fake_steps)
+        monkeypatch.setattr(agent, "add_step_batch", failing_batch)
+        with pytest.raises(ValueError, match="no items"):
+            agent.run_quote_loop(1, {})
+        assert calls == [[{"name": "parse"}]]
+
+    def test_no_flush_without_pending_steps(self, monkeypatch):
+        """Test that already-written (or dropped) steps are not written again."""
+        calls = []
+        monkeypatch.setattr(agent, "_run_quote_steps", lambda run_id, payload, steps: {"ok": True})
+        monkeypatch.setattr(agent, "add_step_batch", lambda run_id, steps: calls.append(steps))
+        assert agent.run_quote_loop(1, {}) == {"ok": True}
+        assert calls == []
+
+
+class TestSummaryErrors:
+    """Test how AI summary failures surface to the quote loop."""
+
+    def test_openai_error_becomes_ai_service_error(self, monkeypatch):
+        """Test that an OpenAI failure is re-raised as AIServiceError."""
+        openai = pytest.importorskip("openai")
+
+        def fail(**kwargs):
+            raise openai.OpenAIError("rate limited")
+
+        fake = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=fail)))
+        monkeypatch.setattr(agent, "_get_openai_client", lambda: fake)
+        monkeypatch.setattr(agent, "_build_summary_prompts", lambda *args: ("sys", "user-error-test"))
+
+        with pytest.raises(agent.AIServiceError, match="rate limited"):
+            agent._generate_summary({}, {}, 1, "C", None, "English")
+
+
+# Run tests directly if needed
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])